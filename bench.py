@@ -0,0 +1,386 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import subprocess
+
+# Headless by default so the suite runs on CI machines and over SSH
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.chdir(os.path.dirname(os.path.abspath(__file__))) # test.py loads its assets relative to the cwd
+
+from PySide6 import __version__ as PYSIDE_VERSION
+from PySide6.QtCore import Qt, QEvent, QObject, QPoint, QPointF, QRectF
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtWidgets import QApplication
+
+from test import (
+    HotspotGridIndex, HotspotModel, DeviceClient, ModbusTcpTransport,
+    MainWindow, SvgViewer, SwitchPosition, HotspotType, compile_svg, configure_fixtures
+)
+from loopback import LoopbackModbusServer
+
+HOTSPOT_COUNTS = (10, 100, 1000, 10000)
+SCALE_FACTORS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+def synthetic_hotspots(count, seed=0):
+    # Switches scattered over a board that grows with the count, keeping density realistic
+    rng = random.Random(seed)
+    side = max(1000.0, (count ** 0.5) * 60.0)
+    return HotspotModel.from_records(
+        {"name": f"Switch {i + 1}", "type": "switch", "state": "default", "register": 1000 + i,
+         "rect": [rng.uniform(0, side), rng.uniform(0, side), 20.026, 20.026]}
+        for i in range(count)
+    ), side
+
+
+def synthetic_viewer(count):
+    # SvgViewer on the real schematic, with a synthetic hotspot file of the given size
+    hotspots, _ = synthetic_hotspots(count)
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"hotspots": hotspots.to_records()}, f)
+    try:
+        return SvgViewer(compile_svg("background.svg"), hotspots_path=f.name)
+    finally:
+        os.remove(f.name)
+
+
+def timed(function, repeat):
+    # Returns (min, mean) milliseconds over repeat calls
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return min(samples), sum(samples) / len(samples)
+
+
+def settle(app, viewer):
+    # Waits until every queued tile render has landed and been painted
+    while viewer.svg_layer.pending_tiles:
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+
+
+class FirstPaintFilter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.painted_at = None
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self.painted_at is None:
+            self.painted_at = time.perf_counter()
+        return False
+
+
+def startup_child(spawned_at):
+    # Runs in a fresh interpreter. Timings are wall-clock from the parent spawning the process,
+    # so interpreter start and imports count: MainWindow built -> first frame on screen ->
+    # schematic loaded -> first frame with the schematic
+    elapsed = lambda: (time.time() - spawned_at) * 1e3
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    timings = {"construct_ms": elapsed()}
+    first_paint = FirstPaintFilter()
+    window.viewer.viewport().installEventFilter(first_paint)
+    window.resize(1600, 900)
+    window.show()
+    while first_paint.painted_at is None:
+        app.processEvents()
+    timings["first_frame_ms"] = elapsed()
+    while window.viewer.svg_layer is None:
+        app.processEvents()
+    timings["schematic_ready_ms"] = elapsed()
+    first_paint.painted_at = None
+    while first_paint.painted_at is None:
+        app.processEvents()
+    timings["schematic_frame_ms"] = elapsed()
+    print(json.dumps(timings))
+    window.close()
+
+
+def bench_startup(runs=5):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, __file__, "--startup-child", repr(time.time())],
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: min(r[key] for r in results) for key in results[0]}
+
+
+def bench_repaint(app, repeat=5):
+    # Full-viewport repaint per scale: "cold" is the first frame with tiles still in flight,
+    # "warm" is a repaint once every visible tile is cached
+    viewer = synthetic_viewer(10)
+    viewer.resize(1600, 900)
+    viewer.show()
+    app.processEvents()
+    results = {}
+    for scale in SCALE_FACTORS:
+        viewer.resetTransform()
+        viewer.scale(scale, scale)
+        viewer.scale_factor = scale
+        viewer.svg_layer.tile_cache.clear()
+        cold_ms, _ = timed(viewer.viewport().repaint, 1)
+        settle(app, viewer)
+        warm_min, warm_mean = timed(viewer.viewport().repaint, repeat)
+        results[f"{scale:g}"] = {"cold_ms": cold_ms, "warm_min_ms": warm_min, "warm_mean_ms": warm_mean}
+    viewer.svg_layer.shutdown()
+    viewer.close()
+    return results
+
+
+def bench_pan(app, steps=120, step_px=15, scale=2.0):
+    # Left-drag pan driven through mouseMoveEvent, one repaint per step, tiles cached beforehand
+    viewer = synthetic_viewer(10)
+    viewer.resize(1600, 900)
+    viewer.show()
+    viewer.scale(scale, scale)
+    viewer.scale_factor = scale
+    app.processEvents()
+    viewer.svg_layer.cancel_pending()
+    settle(app, viewer)
+
+    def mouse(kind, pos, buttons):
+        return QMouseEvent(kind, QPointF(pos), QPointF(viewer.viewport().mapToGlobal(pos)),
+                           Qt.LeftButton, buttons, Qt.NoModifier)
+
+    pos = QPoint(800, 450)
+    viewer.mousePressEvent(mouse(QEvent.MouseButtonPress, pos, Qt.LeftButton))
+    samples = []
+    for i in range(steps):
+        direction = 1 if (i // 30) % 2 == 0 else -1 # Back and forth so the view stays on the board
+        pos = QPoint(pos.x() + direction * step_px, pos.y() + direction * step_px // 3)
+        start = time.perf_counter()
+        viewer.mouseMoveEvent(mouse(QEvent.MouseMove, pos, Qt.LeftButton))
+        viewer.viewport().repaint()
+        samples.append((time.perf_counter() - start) * 1e3)
+        app.processEvents()
+    viewer.mouseReleaseEvent(mouse(QEvent.MouseButtonRelease, pos, Qt.NoButton))
+    viewer.svg_layer.shutdown()
+    viewer.close()
+    samples.sort()
+    return {
+        "steps": steps,
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95)],
+        "max_ms": samples[-1],
+    }
+
+
+def bench_tile_stall(app, scales=(1.0, 2.0, 3.0)):
+    # Longest the GUI thread goes unresponsive while a whole viewport of tiles renders in the
+    # background. The loop wakes every millisecond, so anything much longer is a stall a user
+    # would feel as a dropped frame or a laggy drag.
+    viewer = synthetic_viewer(10)
+    viewer.resize(1600, 900)
+    viewer.show()
+    app.processEvents()
+    results = {}
+    for scale in scales:
+        viewer.resetTransform()
+        viewer.scale(scale, scale)
+        viewer.scale_factor = scale
+        viewer.svg_layer.tile_cache.clear()
+        viewer.viewport().repaint() # Queues every visible tile
+        gaps = []
+        start = last = time.perf_counter()
+        while viewer.svg_layer.pending_tiles:
+            app.processEvents()
+            time.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append((now - last) * 1e3)
+            last = now
+        gaps.sort()
+        results[f"{scale:g}"] = {
+            "tiles_ms": (last - start) * 1e3,
+            "max_stall_ms": gaps[-1] if gaps else 0.0,
+            "p95_stall_ms": gaps[int(len(gaps) * 0.95)] if gaps else 0.0,
+        }
+    viewer.svg_layer.shutdown()
+    viewer.close()
+    return results
+
+
+def bench_switch_overlays(app, counts=HOTSPOT_COUNTS):
+    # Every switch toggled through update_switch_overlay, first (item creation) and second pass (reuse)
+    results = {}
+    for count in counts:
+        viewer = synthetic_viewer(count)
+        switches = viewer.hotspots.indices_of(HotspotType.SWITCH).tolist()
+        passes = []
+        for position in (SwitchPosition.UP, SwitchPosition.DOWN):
+            start = time.perf_counter()
+            for index in switches:
+                viewer.hotspots.set_state(index, position)
+                viewer.update_switch_overlay(index)
+            passes.append((time.perf_counter() - start) * 1e3)
+        results[str(count)] = {"first_pass_ms": passes[0], "second_pass_ms": passes[1],
+                               "per_switch_us": passes[1] / count * 1e3}
+        viewer.svg_layer.shutdown()
+        viewer.deleteLater()
+        app.processEvents()
+    return results
+
+
+def linear_hit(rects, point):
+    # The pre-index hit test: build a QRectF per hotspot and scan in order
+    for i, (x, y, w, h) in enumerate(rects):
+        if QRectF(x, y, w, h).contains(point):
+            return i
+    return None
+
+
+def bench_hit_testing(counts=HOTSPOT_COUNTS, queries=2000):
+    results = {}
+    for count in counts:
+        hotspots, side = synthetic_hotspots(count)
+        index = HotspotGridIndex()
+        index.build(hotspots.rects)
+        rects = hotspots.rects.tolist()
+
+        rng = random.Random(1)
+        points = [QPointF(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(queries)]
+
+        start = time.perf_counter()
+        grid_results = [index.query_point(p) for p in points]
+        grid_us = (time.perf_counter() - start) / queries * 1e6
+
+        linear_queries = max(10, queries // max(1, count // 100)) # Keep the O(n) baseline affordable
+        start = time.perf_counter()
+        linear_results = [linear_hit(rects, p) for p in points[:linear_queries]]
+        linear_us = (time.perf_counter() - start) / linear_queries * 1e6
+
+        assert grid_results[:linear_queries] == linear_results
+        results[str(count)] = {"grid_us": grid_us, "linear_us": linear_us}
+    return results
+
+
+def bench_device_io(writes=500, reads=200, device_latency=0.001):
+    # Loopback Modbus TCP device with a simulated per-transaction turnaround
+    server = LoopbackModbusServer(latency=device_latency).start()
+    client = DeviceClient(ModbusTcpTransport(server.host, server.port))
+    client.read_registers(0, 1).result() # Connect outside the timed sections
+
+    start = time.perf_counter()
+    for i in range(reads):
+        client.read_registers(100, 18).result()
+    read_ms = (time.perf_counter() - start) / reads * 1e3
+
+    start = time.perf_counter()
+    for i in range(writes):
+        client.write_registers(100 + i % 200, [i & 1]).result() # One round trip per write
+    serial_s = time.perf_counter() - start
+
+    server.transactions = 0
+    start = time.perf_counter()
+    futures = [client.write_registers(100 + i % 200, [i & 1]) for i in range(writes)]
+    for future in futures:
+        future.result()
+    queued_s = time.perf_counter() - start
+
+    client.close()
+    server.stop()
+    return {
+        "read_18_registers_ms": read_ms,
+        "awaited_writes_per_s": writes / serial_s,
+        "queued_writes_per_s": writes / queued_s,
+        "queued_transactions": server.transactions,
+    }
+
+
+def bench_batch(fixtures=16, jobs=(1, 4, 16), device_latency=0.002):
+    # Headless batch configuration of loopback TCP fixtures, one link each: fixtures/s per job count
+    servers = [LoopbackModbusServer(latency=device_latency).start() for _ in range(fixtures)]
+    hotspots = HotspotModel.load("hotspots.json")
+    settings = {"states": {name: "up" for name in hotspots.names if name.startswith("Switch ")},
+                "frequency": "13.560 MHz"}
+    targets = [{"name": f"Jig {i + 1}", "interface": "tcp", "ip_address": server.host, "tcp_port": server.port}
+               for i, server in enumerate(servers)]
+    results = {}
+    for count in jobs:
+        start = time.perf_counter()
+        outcome = configure_fixtures(targets, hotspots, settings, max_parallel=count, verify=True)
+        elapsed = time.perf_counter() - start
+        assert all(result["ok"] for result in outcome)
+        results[str(count)] = {"elapsed_ms": elapsed * 1e3, "fixtures_per_s": fixtures / elapsed}
+    for server in servers:
+        server.stop()
+    return results
+
+
+SCENARIOS = ("startup", "repaint", "pan", "tile_stall", "switch_overlays", "hit_testing", "device_io", "batch")
+
+
+def run(scenarios):
+    app = QApplication.instance() or QApplication(sys.argv)
+    compile_svg("background.svg") # Build caches once so no scenario pays for them
+    results = {}
+    for name in scenarios:
+        print(f"[bench] {name}...", file=sys.stderr)
+        if name == "startup":
+            results[name] = bench_startup()
+        elif name in ("repaint", "pan", "tile_stall", "switch_overlays"):
+            results[name] = globals()[f"bench_{name}"](app)
+        else:
+            results[name] = globals()[f"bench_{name}"]()
+    return results
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(current, baseline_path):
+    # Prints every metric next to a previous run's value
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = flatten(json.load(f)["results"])
+    for key, value in flatten(current).items():
+        old = baseline.get(key)
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            print(f"{key:<45} {old:>12.3f} -> {value:>12.3f} ({(value - old) / old * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SvgViewer performance benchmarks")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"scenarios to run, any of: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="JSON", help="previous results file to compare against")
+    parser.add_argument("--startup-child", type=float, metavar="SPAWNED_AT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_child is not None:
+        startup_child(args.startup_child)
+        sys.exit(0)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    results = run(args.scenarios or SCENARIOS)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pyside": PYSIDE_VERSION,
+        "platform": platform.platform(),
+        "qpa": os.environ.get("QT_QPA_PLATFORM"),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        compare(results, args.compare)
+    sys.exit(0)
@@ -0,0 +1,88 @@
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from test import (
+    MODBUS_READ_HOLDING_REGISTERS, MODBUS_WRITE_SINGLE_REGISTER, MODBUS_WRITE_MULTIPLE_REGISTERS, modbus_crc
+)
+
+
+class LoopbackTCPServer(socketserver.ThreadingTCPServer):
+    # Rebinding right after a previous run must not fail on a port in TIME_WAIT
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class LoopbackModbusServer:
+    # In-process Modbus device stand-in for development and benchmarks. Serves Modbus TCP, or
+    # Modbus RTU frames over TCP (framing="rtu", reachable through pyserial's socket:// URLs).
+    def __init__(self, host="127.0.0.1", port=0, framing="tcp", latency=0.0):
+        self.registers = [0] * 65536
+        self.transactions = 0
+        self.latency = latency # Simulated device turnaround per transaction, seconds
+        owner = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                try:
+                    while True:
+                        if framing == "tcp":
+                            header = self._recv(7)
+                            transaction_id, _, length, unit_id = struct.unpack(">HHHB", header)
+                            reply = owner.handle_pdu(self._recv(length - 1))
+                            self.request.sendall(struct.pack(">HHHB", transaction_id, 0, len(reply) + 1, unit_id) + reply)
+                        else:
+                            head = self._recv(2)
+                            if head[1] == MODBUS_WRITE_MULTIPLE_REGISTERS:
+                                body = self._recv(5)
+                                body += self._recv(body[4])
+                            else:
+                                body = self._recv(4)
+                            self._recv(2) # CRC
+                            frame = head[:1] + owner.handle_pdu(head[1:] + body)
+                            self.request.sendall(frame + modbus_crc(frame))
+                except ConnectionError:
+                    pass
+
+            def _recv(self, size):
+                data = b""
+                while len(data) < size:
+                    chunk = self.request.recv(size - len(data))
+                    if not chunk:
+                        raise ConnectionError
+                    data += chunk
+                return data
+
+        self.server = LoopbackTCPServer((host, port), Handler)
+        self.host, self.port = self.server.server_address
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def handle_pdu(self, pdu):
+        self.transactions += 1
+        if self.latency:
+            time.sleep(self.latency)
+        function = pdu[0]
+        if function == MODBUS_READ_HOLDING_REGISTERS:
+            address, count = struct.unpack(">HH", pdu[1:5])
+            values = self.registers[address:address + count]
+            return struct.pack(f">BB{count}H", function, count * 2, *values)
+        if function == MODBUS_WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            self.registers[address] = value
+            return pdu[:5]
+        if function == MODBUS_WRITE_MULTIPLE_REGISTERS:
+            address, count, _ = struct.unpack(">HHB", pdu[1:6])
+            self.registers[address:address + count] = struct.unpack(f">{count}H", pdu[6:6 + count * 2])
+            return pdu[:5]
+        return bytes([function | 0x80, 1]) # Illegal function
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,20 +1,2036 @@
 import sys
-from PySide6.QtCore import Qt, QPointF, QRectF, QSizeF
-from PySide6.QtGui import QPainter, QBrush, QColor, QPen, QAction
+import math
+import multiprocessing
+import re
+import base64
+import copy
+import hashlib
+import json
+import logging
+import queue
+import socket
+import struct
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from enum import IntEnum
+import numpy as np
+from PySide6.QtCore import (
+    Qt, QPoint, QPointF, QRectF, QSizeF, QObject, Signal, QRunnable, QThreadPool, QTimer
+)
+from PySide6.QtGui import QPainter, QBrush, QColor, QPen, QAction, QImage, QPixmap, QGuiApplication
 from PySide6.QtWidgets import (
     QApplication, QGraphicsView, QGraphicsScene, QMainWindow,
     QDialog, QLabel, QVBoxLayout, QComboBox, QPushButton,
     QFileDialog, QWidget, QHBoxLayout, QTabWidget, QFormLayout,
     QLineEdit, QSpinBox, QGraphicsEllipseItem, QGraphicsRectItem,
-    QMenuBar
+    QMenuBar, QStyleOptionGraphicsItem, QMessageBox
 )
-from PySide6.QtSvgWidgets import QGraphicsSvgItem
+from PySide6.QtSvg import QSvgRenderer
 import os
 from PySide6.QtWidgets import QMenu
 
 
+# Reference point for the startup timings reported once the schematic is on screen
+STARTED_AT = time.perf_counter()
+
+
+# --- Instrumentation ---
+# Diagnostics go through the "configurator" logger; the level is set once at startup
+# (CONFIGURATOR_LOG_LEVEL), so disabled messages cost a level check and no formatting.
+log = logging.getLogger("configurator")
+
+
+class Profiler:
+    # Opt-in hot-path instrumentation. Timed spans and counters feed running stats for the HUD and a
+    # bounded timeline that dump() writes in Chrome trace format (chrome://tracing, Perfetto).
+    # While disabled, begin() returns None and end()/count() return straight away.
+    MAX_EVENTS = 200000
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock() # Spans are recorded from the GUI, pool and device threads
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.events = deque(maxlen=self.MAX_EVENTS)
+            self.stats = {} # name -> [count, total_ms, max_ms, last_ms]
+            self.counters = {} # name -> value
+            self.next_async_id = 0
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def begin(self):
+        return time.perf_counter() if self.enabled else None
+
+    def end(self, name, start, category="app", overlapping=False):
+        # overlapping=True for spans that may overlap others on the same thread (queued device
+        # requests); they go to the timeline as async begin/end pairs instead of complete events
+        if start is None:
+            return
+        now = time.perf_counter()
+        ms = (now - start) * 1e3
+        ts = (start - self.origin) * 1e6
+        with self.lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = [0, 0.0, 0.0, 0.0]
+            stat[0] += 1
+            stat[1] += ms
+            stat[2] = max(stat[2], ms)
+            stat[3] = ms
+            if overlapping:
+                self.next_async_id += 1
+                event = {"name": name, "cat": category, "id": self.next_async_id, "pid": self.pid,
+                         "tid": threading.get_ident()}
+                self.events.append(dict(event, ph="b", ts=ts))
+                self.events.append(dict(event, ph="e", ts=ts + ms * 1e3))
+            else:
+                self.events.append({"name": name, "cat": category, "ph": "X", "ts": ts, "dur": ms * 1e3,
+                                    "pid": self.pid, "tid": threading.get_ident()})
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            value = self.counters[name] = self.counters.get(name, 0) + n
+            self.events.append({"name": name, "ph": "C", "ts": (time.perf_counter() - self.origin) * 1e6,
+                                "pid": self.pid, "tid": threading.get_ident(), "args": {"value": value}})
+
+    def stat(self, name):
+        # (count, mean_ms, max_ms, last_ms), zeros if the span was never recorded
+        with self.lock:
+            count, total, maximum, last = self.stats.get(name, (0, 0.0, 0.0, 0.0))
+        return count, (total / count if count else 0.0), maximum, last
+
+    def dump(self, path):
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+PROFILER = Profiler()
+
+
+class ProfilerHud(QLabel):
+    # Small read-out over the corner of a view, refreshed a few times per second from PROFILER.stats.
+    # A frameless tool window of its own: as a translucent child of the viewport, every refresh
+    # would repaint the schematic underneath and add to the paint time it reports.
+    ROWS = (
+        ("frame", "paint"), ("wheel", "wheelEvent"), ("pan", "mouseMoveEvent"),
+        ("overlay", "overlay.update"), ("tile", "tile.render"), ("device", "device.request"),
+    )
+    REFRESH_MS = 250
+
+    def __init__(self, view):
+        super().__init__(view, Qt.Tool | Qt.FramelessWindowHint | Qt.WindowTransparentForInput |
+                         Qt.WindowDoesNotAcceptFocus)
+        self.view = view
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setStyleSheet("background-color: rgb(0, 0, 0); color: white; "
+                           "font-family: monospace; padding: 4px;")
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def start(self):
+        self.refresh()
+        self.show()
+        self.timer.start(self.REFRESH_MS)
+
+    def stop(self):
+        self.timer.stop()
+        self.hide()
+
+    def refresh(self):
+        lines = []
+        for label, name in self.ROWS:
+            count, mean, maximum, last = PROFILER.stat(name)
+            lines.append(f"{label:<8}{last:7.2f} ms  avg {mean:6.2f}  max {maximum:7.2f}  n {count}")
+        counters = PROFILER.counters
+        lines.append(f"overlays created {counters.get('overlay.created', 0)}  "
+                     f"hidden {counters.get('overlay.hidden', 0)}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(self.view.viewport().mapToGlobal(QPoint(8, 8))) # Follows the view as the window moves
+
+
+# --- Schematic compilation ---
+# Inkscape exports are slow for Qt to parse: editor metadata, one <clipPath> per element,
+# thousands of <use> glyph references. compile_svg() rewrites the document once into a flat,
+# equivalent SVG cached next to the source and keyed by its content hash.
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+EDITOR_NAMESPACES = (
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+)
+SVG_CACHE_DIR = ".svgcache"
+SVG_COMPILER_VERSION = 1 # Bump to invalidate cached artifacts when the passes change
+
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+
+_HREF = f"{{{XLINK_NS}}}href"
+_URL_REF = re.compile(r"url\(#([^)]+)\)")
+_PATH_TOKEN = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_TRANSFORM_OP = re.compile(r"(matrix|translate|scale)\s*\(([^)]*)\)")
+_PATH_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "Z": 0}
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_transform(text):
+    # Returns the affine (a, b, c, d, e, f) for simple transform lists, or None if unsupported
+    a, b, c, d, e, f = 1.0, 0.0, 0.0, 1.0, 0.0, 0.0
+    text = (text or "").strip()
+    consumed = 0
+    for match in _TRANSFORM_OP.finditer(text):
+        if text[consumed:match.start()].strip(" ,"):
+            return None
+        consumed = match.end()
+        args = [float(v) for v in re.split(r"[\s,]+", match.group(2).strip()) if v]
+        op = match.group(1)
+        if op == "matrix" and len(args) == 6:
+            m = args
+        elif op == "translate" and len(args) in (1, 2):
+            m = [1, 0, 0, 1, args[0], args[1] if len(args) == 2 else 0]
+        elif op == "scale" and len(args) in (1, 2):
+            m = [args[0], 0, 0, args[1] if len(args) == 2 else args[0], 0, 0]
+        else:
+            return None
+        a, b, c, d, e, f = (a * m[0] + c * m[1], b * m[0] + d * m[1],
+                            a * m[2] + c * m[3], b * m[2] + d * m[3],
+                            a * m[4] + c * m[5] + e, b * m[4] + d * m[5] + f)
+    if text[consumed:].strip(" ,"):
+        return None
+    return a, b, c, d, e, f
+
+
+def _fmt(value):
+    # Two decimals is sub-pixel even at the 10x maximum zoom
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _transform_path_data(d, matrix):
+    # Bakes an affine transform into path data. Arcs are not supported (returns None).
+    a, b, c, dd, e, f = matrix
+
+    def apply(x, y):
+        return a * x + c * y + e, b * x + dd * y + f
+
+    tokens = _PATH_TOKEN.findall(d)
+    out = []
+    cx = cy = start_x = start_y = 0.0
+    i = 0
+    command = None
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        elif command is None:
+            return None
+        upper = command.upper()
+        if upper not in _PATH_ARGS:
+            return None
+        if upper == "Z":
+            out.append("Z")
+            cx, cy = start_x, start_y
+            command = None
+            continue
+        count = _PATH_ARGS[upper]
+        if i + count > len(tokens):
+            return None
+        args = [float(t) for t in tokens[i:i + count]]
+        i += count
+        relative = command.islower()
+        if upper == "H":
+            points = [((cx + args[0]) if relative else args[0], cy)]
+            upper = "L"
+        elif upper == "V":
+            points = [(cx, (cy + args[0]) if relative else args[0])]
+            upper = "L"
+        else:
+            points = [(args[k] + (cx if relative else 0), args[k + 1] + (cy if relative else 0))
+                      for k in range(0, count, 2)]
+        cx, cy = points[-1]
+        if upper == "M":
+            start_x, start_y = cx, cy
+            command = "l" if relative else "L" # Extra coordinate pairs after a moveto are linetos
+        mapped = " ".join(f"{_fmt(x)} {_fmt(y)}" for x, y in (apply(px, py) for px, py in points))
+        out.append(f"{upper}{mapped}")
+    return " ".join(out)
+
+
+def _strip_editor_metadata(root):
+    for parent in list(root.iter()):
+        for child in list(parent):
+            tag = child.tag if isinstance(child.tag, str) else ""
+            if tag.startswith("{") and tag[1:].split("}")[0] in EDITOR_NAMESPACES or _local(tag) == "metadata":
+                parent.remove(child)
+    for element in root.iter():
+        for name in [n for n in element.attrib if n.startswith("{") and n[1:].split("}")[0] in EDITOR_NAMESPACES]:
+            del element.attrib[name]
+
+
+def _use_target_id(use):
+    return (use.get(_HREF) or use.get("href") or "").lstrip("#")
+
+
+def _resolve_uses(root, resolved):
+    # Inlines <use> elements whose target is referenced once. Shared targets (font glyphs used
+    # thousands of times) stay as references: Qt links those without copying, while inlining
+    # them more than doubled the document and made it slower to parse.
+    ids = {el.get("id"): el for el in root.iter() if el.get("id")}
+    while True:
+        parents = {child: parent for parent in root.iter() for child in parent}
+        uses = list(root.iter(f"{{{SVG_NS}}}use"))
+        use_counts = {}
+        for use in uses:
+            use_counts[_use_target_id(use)] = use_counts.get(_use_target_id(use), 0) + 1
+        uses = [use for use in uses if use_counts[_use_target_id(use)] == 1]
+        if not uses:
+            return
+        for use in uses:
+            parent = parents[use]
+            index = list(parent).index(use)
+            parent.remove(use)
+            target = ids.get(_use_target_id(use))
+            if target is None:
+                continue # Dangling reference renders nothing
+            clone = copy.deepcopy(target)
+            # Presentation attributes on <use> are inherited by the referenced content
+            for name, value in use.attrib.items():
+                if name in (_HREF, "href", "x", "y", "width", "height", "id", "transform") or name.startswith("data-"):
+                    continue
+                clone.attrib.setdefault(name, value)
+            transform = use.get("transform", "")
+            x, y = float(use.get("x", 0)), float(use.get("y", 0))
+            if x or y:
+                transform += f" translate({x:g},{y:g})"
+            if target.get("transform"):
+                transform += " " + target.get("transform")
+            transform = transform.strip()
+            matrix = _parse_transform(transform)
+            if _local(clone.tag) == "path" and matrix is not None and "stroke" not in clone.attrib:
+                # Filled outlines (glyphs) can take the transform directly in their coordinates
+                baked = _transform_path_data(clone.get("d", ""), matrix)
+                if baked is not None:
+                    clone.set("d", baked)
+                    transform = ""
+            if transform:
+                clone.set("transform", transform)
+            else:
+                clone.attrib.pop("transform", None)
+            if use.get("id"):
+                clone.set("id", use.get("id"))
+            else:
+                clone.attrib.pop("id", None)
+            for element in clone.iter():
+                resolved.add(element)
+            parent.insert(index, clone)
+
+
+def _referenced_ids(root, skip):
+    refs = set()
+    for element in root.iter():
+        if element in skip:
+            continue
+        for value in element.attrib.values():
+            refs.update(_URL_REF.findall(value))
+        href = element.get(_HREF) or element.get("href")
+        if href and href.startswith("#"):
+            refs.add(href[1:])
+    return refs
+
+
+def _prune_unused_defs(root):
+    for defs in root.iter(f"{{{SVG_NS}}}defs"):
+        refs = _referenced_ids(root, skip=set(defs.iter()) - {defs})
+        # Definitions can reference each other (e.g. a clipPath using a gradient), so keep those too
+        refs |= _referenced_ids(defs, skip={defs} | {el for el in defs if el.get("id") not in refs})
+        for child in list(defs):
+            if child.get("id") not in refs:
+                defs.remove(child)
+
+
+def _dedupe_clip_paths(root):
+    canonical = {}
+    rename = {}
+    for defs in root.iter(f"{{{SVG_NS}}}defs"):
+        for clip in list(defs):
+            if _local(clip.tag) != "clipPath":
+                continue
+            key = (tuple(sorted((k, v) for k, v in clip.attrib.items() if k != "id")),
+                   tuple((child.tag, tuple(sorted((k, v) for k, v in child.attrib.items() if k != "id")))
+                         for child in clip))
+            if key in canonical:
+                rename[clip.get("id")] = canonical[key]
+                defs.remove(clip)
+            else:
+                canonical[key] = clip.get("id")
+    for element in root.iter():
+        value = element.get("clip-path")
+        if value:
+            element.set("clip-path", _URL_REF.sub(lambda m: f"url(#{rename.get(m.group(1), m.group(1))})", value))
+
+
+def _merge_sibling_groups(root):
+    # Adjacent <g> wrappers with identical attributes (typically the same clip) become one group
+    for parent in list(root.iter()):
+        previous = None
+        for child in list(parent):
+            signature = None
+            if _local(child.tag) == "g":
+                signature = tuple(sorted((k, v) for k, v in child.attrib.items() if k != "id"))
+            if signature is not None and previous is not None and previous[1] == signature:
+                previous[0].extend(list(child))
+                parent.remove(child)
+            else:
+                previous = (child, signature) if signature is not None else None
+
+
+def _merge_paths(root, resolved):
+    # Consecutive glyph outlines resolved from <use> with the same fill become one path. Strokes are
+    # left alone: Qt strokes one huge merged path far slower than many small ones, and overlapping
+    # fills are only safe to merge for glyphs (non-evenodd, never overlapping with opposite winding).
+    def mergeable(element):
+        if _local(element.tag) != "path" or len(element):
+            return None
+        attrs = {k: v for k, v in element.attrib.items() if k not in ("id", "d")}
+        if any(k in attrs for k in ("opacity", "stroke-opacity", "fill-opacity", "stroke-dasharray", "clip-path", "mask", "filter")):
+            return None
+        if attrs.get("stroke", "none") != "none" or attrs.get("fill") == "none":
+            return None
+        if element not in resolved or attrs.get("fill-rule") == "evenodd":
+            return None
+        return tuple(sorted(attrs.items()))
+
+    for parent in list(root.iter()):
+        run = []
+        for child in list(parent) + [None]:
+            signature = mergeable(child) if child is not None else None
+            if run and signature is not None and signature == run[0][1]:
+                run.append((child, signature))
+                continue
+            if len(run) > 1:
+                first = run[0][0]
+                parts = []
+                for element, _ in run:
+                    d = element.get("d", "").strip()
+                    if d[:1] == "m":
+                        d = "M" + d[1:] # A leading relative moveto is absolute
+                    parts.append(d)
+                first.set("d", " ".join(parts))
+                for element, _ in run[1:]:
+                    parent.remove(element)
+            run = [(child, signature)] if signature is not None else []
+
+
+def _extract_images(root, cache_dir, digest):
+    written = {}
+    for image in root.iter(f"{{{SVG_NS}}}image"):
+        attr = _HREF if image.get(_HREF) else "href"
+        href = (image.get(attr) or "").strip()
+        match = re.match(r"data:image/(\w+);base64,(.*)", href, re.S)
+        if not match:
+            continue
+        payload = re.sub(r"\s+", "", match.group(2))
+        if payload not in written:
+            extension = "jpg" if match.group(1) == "jpeg" else match.group(1)
+            file_name = f"{digest}_image{len(written)}.{extension}"
+            with open(os.path.join(cache_dir, file_name), "wb") as f:
+                f.write(base64.b64decode(payload))
+            written[payload] = file_name
+        image.set(attr, written[payload]) # Relative to the compiled document
+
+
+def compile_svg(svg_path, cache_dir=None):
+    # Returns the path of a compiled copy of svg_path, building it only if the source changed
+    with open(svg_path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source + f"v{SVG_COMPILER_VERSION}".encode()).hexdigest()[:24]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(svg_path)), SVG_CACHE_DIR)
+    compiled_path = os.path.join(cache_dir, f"{digest}.svg")
+    if os.path.exists(compiled_path):
+        return compiled_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    root = ET.fromstring(source)
+    resolved = set()
+    _strip_editor_metadata(root)
+    _resolve_uses(root, resolved)
+    _prune_unused_defs(root)
+    _dedupe_clip_paths(root)
+    _merge_sibling_groups(root)
+    _merge_paths(root, resolved)
+    _extract_images(root, cache_dir, digest)
+
+    temp_path = compiled_path + ".tmp"
+    ET.ElementTree(root).write(temp_path, encoding="utf-8", xml_declaration=True)
+    os.replace(temp_path, compiled_path) # Atomic, so a crash never leaves a half-written cache
+    log.debug("Compiled %s -> %s", svg_path, compiled_path)
+    return compiled_path
+
+
+# --- Level of detail ---
+# At overview zoom most schematic elements (glyphs, short traces) are smaller than a pixel. For each
+# cutoff below, build_lod_documents() writes a copy of the document without the leaf elements whose
+# bounding box is smaller than the cutoff, and TiledSvgLayer renders tiles of zoomed-out levels from the
+# coarsest copy that still keeps every feature at least LOD_MIN_PIXELS wide on screen.
+LOD_MIN_PIXELS = 1.0
+LOD_CUTOFFS = (2.0, 4.0, 8.0) # Feature sizes, in scene units; 8 covers the 0.1 minimum zoom
+LOD_VERSION = 1
+_LOD_LEAVES = ("path", "use", "image", "rect", "circle", "ellipse", "line", "polyline", "polygon", "text")
+
+
+def _cache_dir_for(svg_path):
+    directory = os.path.dirname(os.path.abspath(svg_path))
+    return directory if os.path.basename(directory) == SVG_CACHE_DIR else os.path.join(directory, SVG_CACHE_DIR)
+
+
+def build_lod_documents(svg_path, cache_dir=None):
+    # Returns {cutoff: path} of reduced documents, building only the ones not cached yet
+    with open(svg_path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source + f"lod{LOD_VERSION}".encode()).hexdigest()[:24]
+    cache_dir = cache_dir or _cache_dir_for(svg_path)
+    documents = {cutoff: os.path.join(cache_dir, f"{digest}.lod{cutoff:g}.svg") for cutoff in LOD_CUTOFFS}
+    if all(os.path.exists(path) for path in documents.values()):
+        return documents
+
+    os.makedirs(cache_dir, exist_ok=True)
+    renderer = QSvgRenderer(svg_path)
+    root = ET.fromstring(source)
+    definitions = {el for defs in root.iter(f"{{{SVG_NS}}}defs") for el in defs.iter()}
+    sizes = {}
+    for element in root.iter():
+        element_id = element.get("id")
+        if element_id and element not in definitions and _local(element.tag) in _LOD_LEAVES:
+            # Bounds include the element's own transform; transformForElement adds its parents'
+            bounds = renderer.transformForElement(element_id).mapRect(renderer.boundsOnElement(element_id))
+            sizes[element_id] = max(bounds.width(), bounds.height())
+
+    for cutoff, path in documents.items():
+        if os.path.exists(path):
+            continue
+        layer = copy.deepcopy(root)
+        for parent in list(layer.iter()):
+            for child in list(parent):
+                if sizes.get(child.get("id"), cutoff) < cutoff:
+                    parent.remove(child)
+        # Groups left without children draw nothing
+        for parent in list(layer.iter()):
+            for child in list(parent):
+                if _local(child.tag) == "g" and not any(True for _ in child.iter() if _ is not child and _local(_.tag) in _LOD_LEAVES):
+                    parent.remove(child)
+        temp_path = path + ".tmp"
+        ET.ElementTree(layer).write(temp_path, encoding="utf-8", xml_declaration=True)
+        os.replace(temp_path, path)
+    log.debug("Built level-of-detail layers for %s", svg_path)
+    return documents
+
+
+# Tiles are rendered at discrete zoom levels that line up with the wheel zoom steps:
+# level N is rasterized at ZOOM_STEP ** N device pixels per scene unit.
+TILE_SIZE = 512
+ZOOM_STEP = 1.25
+PREVIEW_SIZE = 1024 # Longest side of the whole-document fallback image, in pixels
+PREVIEW_VERSION = 1
+
+
+class TileCache:
+    # LRU cache of rendered tile pixmaps, bounded by an approximate memory budget
+    def __init__(self, budget_bytes=256 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._tiles = OrderedDict()
+
+    def get(self, key):
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key) # Mark as most recently used
+        return pixmap
+
+    def put(self, key, pixmap):
+        if key in self._tiles:
+            self.used_bytes -= self._pixmap_bytes(self._tiles.pop(key))
+        self._tiles[key] = pixmap
+        self.used_bytes += self._pixmap_bytes(pixmap)
+        # Evict least recently used tiles, but never the one just added
+        while self.used_bytes > self.budget_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self.used_bytes -= self._pixmap_bytes(evicted)
+
+    def clear(self):
+        self._tiles.clear()
+        self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * 4
+
+
+def render_svg_region(renderer, bounds, scene_rect, resolution, size):
+    # Rasterize scene_rect of a document laid out in bounds at the given pixels-per-unit
+    image = QImage(size.width(), size.height(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+    painter.scale(resolution, resolution)
+    painter.translate(-scene_rect.x(), -scene_rect.y())
+    renderer.render(painter, bounds)
+    painter.end()
+    return image
+
+
+def load_preview(svg_path, cache_dir=None):
+    # Returns (bounds, preview QImage) of a document. The preview is cached as a PNG keyed by the
+    # document's hash, with the document size in its text chunk, so a warm start reads one small
+    # image instead of parsing and rendering the whole SVG.
+    with open(svg_path, "rb") as f:
+        digest = hashlib.sha256(f.read() + f"preview{PREVIEW_VERSION}".encode()).hexdigest()[:24]
+    cache_dir = cache_dir or _cache_dir_for(svg_path)
+    preview_path = os.path.join(cache_dir, f"{digest}.preview.png")
+    image = QImage(preview_path)
+    size = image.text("size").split() # "width height" in scene units
+    if not image.isNull() and len(size) == 2:
+        return QRectF(0, 0, float(size[0]), float(size[1])), image
+
+    renderer = QSvgRenderer(os.path.abspath(svg_path))
+    # Same bounds QGraphicsSvgItem uses, so scene coordinates (and hotspots) are unchanged
+    bounds = QRectF(QPointF(0, 0), QSizeF(renderer.defaultSize()))
+    resolution = PREVIEW_SIZE / max(bounds.width(), bounds.height(), 1)
+    image = render_svg_region(renderer, bounds, bounds, resolution,
+                              QSizeF(bounds.width() * resolution, bounds.height() * resolution).toSize())
+    image.setText("size", f"{bounds.width()!r} {bounds.height()!r}")
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = preview_path + ".tmp"
+    if image.save(temp_path, "PNG"):
+        os.replace(temp_path, preview_path)
+    return bounds, image
+
+
+# Tiles are rendered in worker processes. QSvgRenderer holds the GIL while it parses and paints,
+# so a render on a GUI-process thread freezes the event loop for as long as the render takes.
+# Each process keeps its parsed documents for its whole life and sends tiles back as raw pixels.
+RENDERERS_PER_PROCESS = 8 # Documents (boards and their LOD layers) kept parsed in one process
+
+_process_renderers = OrderedDict() # In a render process: document path -> QSvgRenderer, LRU
+_process_app = None
+
+
+def _init_render_process():
+    # Text rendering needs a QGuiApplication; render processes never open a window
+    global _process_app
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    _process_app = QGuiApplication(["tile-renderer"])
+
+
+def process_renderer(svg_path):
+    renderer = _process_renderers.pop(svg_path, None)
+    if renderer is None:
+        renderer = QSvgRenderer(svg_path)
+    _process_renderers[svg_path] = renderer
+    while len(_process_renderers) > RENDERERS_PER_PROCESS:
+        _process_renderers.popitem(last=False)
+    return renderer
+
+
+def render_tile_pixels(svg_path, bounds, key):
+    # Runs in a render process: one (level, col, row) tile of a document laid out in bounds (an
+    # x, y, width, height tuple), as TILE_SIZE x TILE_SIZE premultiplied ARGB32 bytes
+    level, col, row = key
+    image = render_svg_region(process_renderer(svg_path), QRectF(*bounds),
+                              TiledSvgLayer.tile_scene_rect(level, col, row), ZOOM_STEP ** level,
+                              QSizeF(TILE_SIZE, TILE_SIZE).toSize())
+    return image.constBits().tobytes()
+
+
+def warm_render_process(svg_path):
+    # Parses a document ahead of its first tile request
+    process_renderer(svg_path)
+
+
+class TileRenderSignals(QObject):
+    # Emitted from the render pool's result thread; delivered on the GUI thread via a queued connection
+    tile_ready = Signal(object, object) # (level, col, row), Future of render_tile_pixels
+
+
+class TiledSvgLayer(QObject):
+    # Draws a schematic from a pyramid of pre-rasterized tiles instead of re-rendering every vector
+    # path on each repaint. It is not a scene item: SvgViewer paints it as the view's
+    # background, so it sits below the overlay items and is only redrawn where it changed.
+    # Missing tiles are rendered in worker processes; until they arrive the closest coarser
+    # tiles (or the whole-document preview) are drawn scaled up in their place.
+    MAX_FALLBACK_LEVELS = 12
+
+    updated = Signal(QRectF) # Scene rect whose pixels just got better (a tile landed)
+
+    def __init__(self, svg_path, lod_documents=None, bounds=None, preview=None, parent=None):
+        super().__init__(parent)
+        # Document, tile cache and preview are shared with every other view of the same board
+        self.schematic = SCHEMATICS.acquire(svg_path, lod_documents, bounds, preview)
+        self.schematic.layers.append(self)
+        self.svg_path = self.schematic.svg_path
+        self.lod_documents = self.schematic.lod_documents
+        self.tile_cache = self.schematic.tile_cache
+        self.bounds = self.schematic.bounds
+        self.preview = self.schematic.preview
+        self.preview_resolution = self.schematic.preview_resolution
+
+        # Unparented: a render still running when the layer goes away emits into a live object
+        self.render_signals = TileRenderSignals()
+        # Always queued: a cancelled future reports back at once, on the thread that cancelled it,
+        # which is the GUI thread in the middle of a paint
+        self.render_signals.tile_ready.connect(self._on_tile_ready, Qt.QueuedConnection)
+        self.pending_tiles = {} # (level, col, row) -> Future
+        self.requested_level = None
+
+    @staticmethod
+    def zoom_level_for(lod):
+        # Smallest level whose resolution is at least the on-screen resolution, so tiles are never upscaled
+        return math.ceil(math.log(lod, ZOOM_STEP) - 1e-6)
+
+    @staticmethod
+    def tile_scene_rect(level, col, row):
+        tile_span = TILE_SIZE / (ZOOM_STEP ** level) # Scene units covered by one tile
+        return QRectF(col * tile_span, row * tile_span, tile_span, tile_span)
+
+    def visible_tiles(self, level, exposed_rect):
+        tile_span = TILE_SIZE / (ZOOM_STEP ** level)
+        rect = exposed_rect.intersected(self.bounds)
+        if rect.isEmpty():
+            return []
+        first_col = int(rect.left() // tile_span)
+        last_col = int(math.ceil(rect.right() / tile_span))
+        first_row = int(rect.top() // tile_span)
+        last_row = int(math.ceil(rect.bottom() / tile_span))
+        return [(level, col, row)
+                for row in range(first_row, last_row)
+                for col in range(first_col, last_col)]
+
+    def document_for_level(self, level):
+        # Coarsest LOD document whose dropped features are all under LOD_MIN_PIXELS at this level
+        cutoff = LOD_MIN_PIXELS / (ZOOM_STEP ** level)
+        usable = [c for c in self.lod_documents if c <= cutoff]
+        return self.lod_documents[max(usable)] if usable else self.svg_path
+
+    def request_tile(self, key):
+        if key in self.pending_tiles:
+            return
+        args = (render_tile_pixels, self.document_for_level(key[0]), self.bounds.getRect(), key)
+        try:
+            future = SCHEMATICS.render_pool.submit(*args)
+        except BrokenProcessPool: # A render process died; start over with fresh ones
+            SCHEMATICS.restart_render_pool()
+            future = SCHEMATICS.render_pool.submit(*args)
+        self.pending_tiles[key] = future
+        start = PROFILER.begin()
+        signals = self.render_signals
+
+        def done(future):
+            if start is not None: # Request to result, as the view sees it: queueing plus the render
+                PROFILER.end("tile.render", start, "tiles", overlapping=True)
+            signals.tile_ready.emit(key, future)
+
+        future.add_done_callback(done)
+
+    def cancel_pending(self):
+        # Drops every render of this layer that has not started yet. The pool is shared between
+        # boards, so only this layer's futures are cancelled; ones already running still land.
+        pending, self.pending_tiles = self.pending_tiles, {}
+        for future in pending.values():
+            future.cancel()
+
+    def shutdown(self):
+        self.cancel_pending()
+        SCHEMATICS.release(self)
+
+    def _on_tile_ready(self, key, future):
+        if self.pending_tiles.get(key) is future:
+            del self.pending_tiles[key]
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            log.error("Rendering tile %s of %s failed: %s", key, self.svg_path, future.exception())
+            if isinstance(future.exception(), BrokenProcessPool):
+                SCHEMATICS.restart_render_pool()
+            return
+        # Tiles that landed after a zoom change are still valid pixels, so keep them
+        # The QImage only borrows the bytes; copy() gives the pixmap pixels of its own
+        image = QImage(future.result(), TILE_SIZE, TILE_SIZE, QImage.Format_ARGB32_Premultiplied).copy()
+        self.tile_cache.put(key, QPixmap.fromImage(image))
+        tile_rect = self.tile_scene_rect(*key)
+        for layer in self.schematic.layers:
+            layer.updated.emit(tile_rect)
+        SCHEMATICS.trim()
+
+    def _draw_fallback(self, painter, target_rect, level):
+        for coarser in range(level - 1, level - 1 - self.MAX_FALLBACK_LEVELS, -1):
+            keys = self.visible_tiles(coarser, target_rect)
+            pixmaps = [self.tile_cache.get(key) for key in keys]
+            if keys and all(pixmap is not None for pixmap in pixmaps):
+                for key, pixmap in zip(keys, pixmaps):
+                    self._draw_part(painter, pixmap, self.tile_scene_rect(*key),
+                                    ZOOM_STEP ** coarser, target_rect)
+                return
+        self._draw_part(painter, self.preview, self.bounds, self.preview_resolution, target_rect)
+
+    @staticmethod
+    def _draw_part(painter, pixmap, pixmap_scene_rect, resolution, target_rect):
+        part = pixmap_scene_rect.intersected(target_rect)
+        if part.isEmpty():
+            return
+        source = QRectF((part.x() - pixmap_scene_rect.x()) * resolution,
+                        (part.y() - pixmap_scene_rect.y()) * resolution,
+                        part.width() * resolution, part.height() * resolution)
+        painter.drawPixmap(part, pixmap, source)
+
+    def paint(self, painter, exposed_rect):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod <= 0:
+            return
+        if painter.device() is not None:
+            lod *= painter.device().devicePixelRatioF()
+        level = self.zoom_level_for(lod)
+        if level != self.requested_level:
+            # Zoom changed: anything still queued for the previous level is stale
+            self.cancel_pending()
+            self.requested_level = level
+
+        for key in self.visible_tiles(level, exposed_rect):
+            tile_rect = self.tile_scene_rect(*key)
+            pixmap = self.tile_cache.get(key)
+            if pixmap is None:
+                self.request_tile(key)
+                self._draw_fallback(painter, tile_rect.intersected(self.bounds), level)
+            else:
+                painter.drawPixmap(tile_rect, pixmap, QRectF(pixmap.rect()))
+
+
+class SharedSchematic:
+    # One loaded board document and its rasters, drawn by one or more TiledSvgLayers
+    def __init__(self, digest, svg_path, lod_documents, bounds, preview, budget_bytes):
+        self.digest = digest # Content hash; the SchematicRegistry key
+        self.svg_path = svg_path
+        # {feature-size cutoff: reduced document} used for zoomed-out levels; see build_lod_documents
+        self.lod_documents = dict(lod_documents or {})
+        self.bounds = bounds
+        # Drawn while tiles are in flight; see load_preview
+        self.preview = QPixmap.fromImage(preview)
+        self.preview_resolution = PREVIEW_SIZE / max(bounds.width(), bounds.height(), 1)
+        self.tile_cache = TileCache(budget_bytes)
+        self.layers = [] # TiledSvgLayers drawing this document; the entry lives while this is non-empty
+
+    def on_screen(self):
+        # Layers are parented to the view that paints them
+        return any(layer.parent() is not None and layer.parent().isVisible() for layer in self.layers)
+
+
+class SchematicRegistry:
+    # Boards loaded in this process, keyed by a hash of the document's content, so byte-identical
+    # schematics opened in several views (or under different file names, or from different
+    # directories, each of which gets its own compile cache) are parsed, previewed and tiled once. All tile caches share one memory budget; once
+    # it is exceeded, boards that are not on screen in any view give their tiles up first.
+    def __init__(self, budget_bytes=256 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.entries = {} # content hash -> SharedSchematic
+        self.overlay_renderers = {} # content hash -> QSvgRenderer (None if the asset is invalid)
+        self._render_pool = None
+
+    @property
+    def render_pool(self):
+        # Started on first use, so scripts that never draw a schematic never spawn processes.
+        # Spawned rather than forked: a forked copy of a process running Qt threads is not safe.
+        if self._render_pool is None:
+            self._render_pool = ProcessPoolExecutor(
+                max_workers=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                mp_context=multiprocessing.get_context("spawn"), initializer=_init_render_process)
+        return self._render_pool
+
+    def acquire(self, svg_path, lod_documents=None, bounds=None, preview=None):
+        # Loaded by path (not bytes) so relative image references resolve next to the document. The
+        # first path a document is opened from is the one every view of it renders from.
+        svg_path = os.path.abspath(svg_path)
+        with open(svg_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        entry = self.entries.get(digest)
+        if entry is None:
+            if bounds is None or preview is None:
+                bounds, preview = load_preview(svg_path)
+            entry = self.entries[digest] = SharedSchematic(digest, svg_path, lod_documents, bounds, preview,
+                                                           self.budget_bytes)
+            # Start the render processes and parse the document while the preview is on screen
+            self.render_pool.submit(warm_render_process, svg_path)
+        return entry
+
+    def release(self, layer):
+        entry = layer.schematic
+        if layer in entry.layers:
+            entry.layers.remove(layer)
+        if not entry.layers and self.entries.get(entry.digest) is entry:
+            del self.entries[entry.digest]
+            entry.tile_cache.clear()
+
+    def used_bytes(self):
+        return sum(entry.tile_cache.used_bytes for entry in self.entries.values())
+
+    def trim(self):
+        if self.used_bytes() <= self.budget_bytes:
+            return
+        for entry in self.entries.values():
+            if not entry.on_screen():
+                entry.tile_cache.clear()
+
+    def overlay_renderer(self, svg_file):
+        # Overlay assets are small and few; they stay loaded once parsed
+        try:
+            with open(svg_file, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        if digest not in self.overlay_renderers:
+            renderer = QSvgRenderer(svg_file)
+            self.overlay_renderers[digest] = renderer if renderer.isValid() else None
+        return self.overlay_renderers[digest]
+
+    def restart_render_pool(self):
+        # Once one of its processes dies the pool fails every render; the next use starts a new one
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = None
+
+    def shutdown(self):
+        # Stops the render processes; renders that have not started are dropped
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=True, cancel_futures=True)
+            self._render_pool = None
+
+
+SCHEMATICS = SchematicRegistry()
+
+
+class SchematicLoadSignals(QObject):
+    loaded = Signal(str, object, object, object) # compiled path, LOD documents, bounds, preview image
+    failed = Signal(str)
+
+
+_schematic_build_lock = threading.Lock()
+
+
+class SchematicLoadJob(QRunnable):
+    # Compiles a schematic and prepares its LOD documents and preview off the GUI thread. Every
+    # step is cached on disk, so on a warm start this is a few file reads and hashes.
+    def __init__(self, signals, source_path):
+        super().__init__()
+        self.signals = signals
+        self.source_path = source_path
+
+    def run(self):
+        try:
+            with _schematic_build_lock: # Boards loading side by side may share cache files
+                svg_path = compile_svg(self.source_path)
+                lod_documents = build_lod_documents(svg_path)
+                bounds, preview = load_preview(svg_path)
+        except (OSError, ET.ParseError) as e:
+            self.signals.failed.emit(f"{self.source_path}: {e}")
+            return
+        except Exception as e: # Nothing else reports a failure on this thread; the view would wait forever
+            log.exception("Loading %s failed", self.source_path)
+            self.signals.failed.emit(f"{self.source_path}: {type(e).__name__}: {e}")
+            return
+        self.signals.loaded.emit(svg_path, lod_documents, bounds, preview)
+
+
+class HotspotType(IntEnum):
+    SWITCH = 0
+    FREQUENCY = 1
+    PLL_CONTROL = 2
+    EXAMPLE = 3
+
+
+class SwitchPosition(IntEnum):
+    DEFAULT = 0
+    UP = 1 # RF2
+    DOWN = 2 # RF1
+
+
+class PllState(IntEnum):
+    DISABLED = 0
+    ENABLED = 1
+
+
+# Names used in data/settings files for each hotspot type and its states
+HOTSPOT_TYPE_NAMES = {
+    "switch": HotspotType.SWITCH,
+    "frequency": HotspotType.FREQUENCY,
+    "pll_control": HotspotType.PLL_CONTROL,
+    "example": HotspotType.EXAMPLE,
+}
+HOTSPOT_STATE_NAMES = {
+    HotspotType.SWITCH: {"default": SwitchPosition.DEFAULT, "up": SwitchPosition.UP, "down": SwitchPosition.DOWN},
+    HotspotType.PLL_CONTROL: {"disabled": PllState.DISABLED, "enabled": PllState.ENABLED},
+}
+
+
+class HotspotModel:
+    # Columnar hotspot storage: one row per hotspot, addressed by integer index.
+    # rects is an (N, 4) float array of x, y, width, height; types/states are small-int enum arrays;
+    # registers holds each hotspot's device holding-register address (-1 if it has none).
+    def __init__(self, names, rects, types, states, registers=None):
+        self.names = list(names)
+        self.rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+        self.types = np.asarray(types, dtype=np.int8)
+        self.states = np.asarray(states, dtype=np.int8)
+        if registers is None:
+            registers = np.full(len(self.names), -1)
+        self.registers = np.asarray(registers, dtype=np.int32)
+        self.index = {name: i for i, name in enumerate(self.names)} # name -> row
+        if len(self.index) != len(self.names):
+            raise ValueError("Hotspot names must be unique")
+        self.edits = 0 # Number of user edits so far; see mark_edited()
+        self.edited_at = np.zeros(len(self.names), dtype=np.int64) # Value of edits at each row's last edit
+
+    @classmethod
+    def from_records(cls, records):
+        names, rects, types, states, registers = [], [], [], [], []
+        for record in records:
+            hotspot_type = HOTSPOT_TYPE_NAMES[record["type"]]
+            names.append(record["name"])
+            rects.append(record["rect"])
+            types.append(hotspot_type)
+            state_names = HOTSPOT_STATE_NAMES.get(hotspot_type, {})
+            states.append(state_names[record["state"]] if "state" in record else 0)
+            registers.append(record.get("register", -1))
+        return cls(names, rects, types, states, registers)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_records(json.load(f)["hotspots"])
+
+    def to_records(self):
+        type_names = {v: k for k, v in HOTSPOT_TYPE_NAMES.items()}
+        records = []
+        for i, name in enumerate(self.names):
+            record = {"name": name, "type": type_names[self.types[i]], "rect": self.rects[i].tolist()}
+            if self.types[i] in HOTSPOT_STATE_NAMES:
+                record["state"] = self.state_name(i)
+            if self.registers[i] >= 0:
+                record["register"] = int(self.registers[i])
+            records.append(record)
+        return records
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"hotspots": self.to_records()}, f, indent=2)
+
+    def __len__(self):
+        return len(self.names)
+
+    def rect(self, i):
+        x, y, w, h = self.rects[i]
+        return QRectF(x, y, w, h)
+
+    def type_of(self, i):
+        return HotspotType(self.types[i])
+
+    def state_name(self, i):
+        state_names = HOTSPOT_STATE_NAMES.get(HotspotType(self.types[i]), {})
+        for name, value in state_names.items():
+            if value == self.states[i]:
+                return name
+        return None
+
+    def indices_of(self, hotspot_type):
+        return np.flatnonzero(self.types == hotspot_type)
+
+    def set_state(self, i, state):
+        changed = self.states[i] != state
+        self.states[i] = state
+        return changed
+
+    def set_states(self, indices, states):
+        # Vectorized bulk update; returns the indices whose state actually changed
+        indices = np.asarray(indices, dtype=np.intp)
+        states = np.broadcast_to(np.asarray(states, dtype=np.int8), indices.shape)
+        changed = indices[self.states[indices] != states]
+        self.states[indices] = states
+        return changed
+
+    def mark_edited(self, indices):
+        # Stamps hotspots the user changed (as opposed to the hardware), so a device read issued
+        # before the edit can tell that its values for them are already out of date
+        self.edits += 1
+        self.edited_at[indices] = self.edits
+
+    def edited_since(self, edits, indices):
+        # Mask over indices: True where the hotspot was edited after self.edits was `edits`
+        return self.edited_at[indices] > edits
+
+    def parse_states(self, state_names):
+        # {"Switch 1": "up", ...} -> (indices, states) arrays; raises ValueError on unknown entries
+        indices = np.empty(len(state_names), dtype=np.intp)
+        states = np.empty(len(state_names), dtype=np.int8)
+        for k, (name, state_name) in enumerate(state_names.items()):
+            if name not in self.index:
+                raise ValueError(f"Unknown hotspot: {name}")
+            i = self.index[name]
+            valid = HOTSPOT_STATE_NAMES.get(HotspotType(self.types[i]), {})
+            if state_name not in valid:
+                raise ValueError(f"Invalid state {state_name!r} for {name}")
+            indices[k] = i
+            states[k] = valid[state_name]
+        return indices, states
+
+    def states_of(self, hotspot_type):
+        # (indices, states) for every hotspot of a type, e.g. all PLL enable states in one read
+        indices = self.indices_of(hotspot_type)
+        return indices, self.states[indices].copy()
+
+    def hit_rects(self, offset_x=0.0, offset_y=0.0):
+        # Rects used for hit-testing: non-switch hotspots are shifted by the click offset
+        rects = self.rects.copy()
+        shifted = self.types != HotspotType.SWITCH
+        rects[shifted, 0] += offset_x
+        rects[shifted, 1] += offset_y
+        return rects
+
+
+def load_settings(path):
+    # Settings file: {"states": {"Switch 1": "up", "PLL Control 2": "enabled", ...}, "frequency": "13.560 MHz"}
+    with open(path, "r", encoding="utf-8") as f:
+        return check_settings(json.load(f))
+
+
+def check_settings(settings):
+    # Raises ValueError unless settings has the shape load_settings documents; returns it unchanged
+    if not isinstance(settings, dict) or not isinstance(settings.get("states", {}), dict):
+        raise ValueError("Settings file must be an object with a \"states\" mapping")
+    for name, state_name in settings.get("states", {}).items():
+        if not isinstance(state_name, str):
+            raise ValueError(f"State of {name} must be a string, not {type(state_name).__name__}")
+    if not isinstance(settings.get("frequency", ""), str):
+        raise ValueError(f"Frequency must be a string such as \"13.560 MHz\", "
+                         f"not {type(settings['frequency']).__name__}")
+    return settings
+
+
+class HotspotHistory:
+    # Command log of hotspot state edits. Each edit is stored as one delta - the indices it changed
+    # with their states before and after - so undo, redo and moving between revisions only touch
+    # (and only push to hardware) what actually changed. A revision is the number of edits since
+    # the model was loaded, which makes it a compact snapshot of a configuration; recording an
+    # edit after undoing discards the revisions that could have been redone. An edit may also set
+    # the board frequency, which is logged next to its delta so undo and redo restore it as well.
+    def __init__(self, hotspots, limit=1000):
+        self.hotspots = hotspots
+        self.limit = limit
+        self.deltas = [] # (indices, before, after) arrays, oldest first
+        self.frequencies = [] # (before, after) kHz per delta; None where the edit left the frequency alone
+        self.base = 0 # Revision before deltas[0]; older deltas have been dropped
+        self.revision = 0
+
+    def can_undo(self):
+        return self.revision > self.base
+
+    def can_redo(self):
+        return self.revision < self.base + len(self.deltas)
+
+    def record(self, indices, states, frequency=None, previous_frequency=None):
+        # Applies an edit to the model and logs it; returns the indices whose state changed. A
+        # frequency (kHz) that differs from previous_frequency, the one the board had before the
+        # edit (None if unknown), is logged with it, so an edit may change the frequency alone.
+        indices = np.asarray(indices, dtype=np.intp)
+        states = np.broadcast_to(np.asarray(states, dtype=np.int8), indices.shape)
+        # Last assignment wins when an index repeats, as with a plain array store
+        indices, last = np.unique(indices[::-1], return_index=True)
+        states = states[::-1][last]
+        changed = self.hotspots.states[indices] != states
+        indices, states = indices[changed], states[changed]
+        frequency = (previous_frequency, frequency) if frequency not in (None, previous_frequency) else None
+        if len(indices) == 0 and frequency is None:
+            return indices
+        self.deltas[self.revision - self.base:] = [(indices, self.hotspots.states[indices].copy(), states.copy())]
+        self.frequencies[self.revision - self.base:] = [frequency]
+        self.hotspots.states[indices] = states
+        self.revision += 1
+        if len(self.deltas) > self.limit:
+            del self.deltas[0]
+            del self.frequencies[0]
+            self.base += 1
+        return indices
+
+    def _span(self, from_revision, to_revision):
+        # Positions in deltas of the edits between two revisions
+        first, last = sorted((from_revision, to_revision))
+        if first < self.base or last > self.base + len(self.deltas):
+            raise ValueError(f"Revision {first if first < self.base else last} is not in the history")
+        return slice(first - self.base, last - self.base)
+
+    def diff(self, from_revision, to_revision):
+        # Net change between two revisions as (indices, states at to_revision). Walks only the
+        # deltas in between, so the cost follows the number of edits, not the number of hotspots.
+        deltas = self.deltas[self._span(from_revision, to_revision)]
+        if to_revision < from_revision:
+            deltas = [(indices, after, before) for indices, before, after in reversed(deltas)]
+        start, end = {}, {}
+        for indices, before, after in deltas:
+            for i, old, new in zip(indices.tolist(), before.tolist(), after.tolist()):
+                start.setdefault(i, old)
+                end[i] = new
+        changed = [i for i, state in end.items() if state != start[i]]
+        return np.array(changed, dtype=np.intp), np.array([end[i] for i in changed], dtype=np.int8)
+
+    def frequency_change(self, from_revision, to_revision):
+        # Frequency (kHz) at to_revision if the edits in between changed it, otherwise None
+        changes = [change for change in self.frequencies[self._span(from_revision, to_revision)] if change]
+        if not changes:
+            return None
+        if to_revision < from_revision:
+            changes = [(after, before) for before, after in reversed(changes)]
+        start, end = changes[0][0], changes[-1][1]
+        return end if end != start else None
+
+    def checkout(self, revision):
+        # Moves the model to another revision; returns the indices whose state changed
+        indices, states = self.diff(self.revision, revision)
+        self.revision = revision
+        return self.hotspots.set_states(indices, states)
+
+    def undo(self):
+        return self.checkout(self.revision - 1) if self.can_undo() else np.empty(0, dtype=np.intp)
+
+    def redo(self):
+        return self.checkout(self.revision + 1) if self.can_redo() else np.empty(0, dtype=np.intp)
+
+
+class HotspotGridIndex:
+    # Uniform grid over scene coordinates. Each cell lists the hotspots whose (offset-adjusted)
+    # hit rect overlaps it, so a click only tests the handful of hotspots in one cell.
+    def __init__(self, cell_size=32.0):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = [] # Hotspot indices, in model order
+        self.bounds = [] # (left, top, right, bottom) hit rect per entry
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+        self.bounds.clear()
+
+    def _cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (range(math.floor(left / size), math.floor(right / size) + 1),
+                range(math.floor(top / size), math.floor(bottom / size) + 1))
+
+    def insert(self, entry, left, top, width, height):
+        position = len(self.entries)
+        right, bottom = left + width, top + height
+        self.entries.append(entry)
+        self.bounds.append((left, top, right, bottom))
+        cols, rows = self._cell_range(left, top, right, bottom)
+        for col in cols:
+            for row in rows:
+                self.cells.setdefault((col, row), []).append(position)
+
+    def build(self, rects):
+        # Indexes every row of an (N, 4) x, y, width, height array under its row number
+        self.clear()
+        for i, (left, top, width, height) in enumerate(rects.tolist()):
+            self.insert(i, left, top, width, height)
+
+    def query_point(self, point):
+        # Returns the first hotspot (in model order) whose rect contains point, like the old linear scan
+        x, y = point.x(), point.y()
+        size = self.cell_size
+        for position in self.cells.get((math.floor(x / size), math.floor(y / size)), ()):
+            left, top, right, bottom = self.bounds[position]
+            if left <= x <= right and top <= y <= bottom:
+                return self.entries[position] # Cell lists are built in list order
+        return None
+
+    def query_rect(self, rect):
+        # Returns every hotspot whose rect intersects rect, in model order (hover, rubber-band selection)
+        q_left, q_top = rect.x(), rect.y()
+        q_right, q_bottom = q_left + rect.width(), q_top + rect.height()
+        cols, rows = self._cell_range(q_left, q_top, q_right, q_bottom)
+        found = set()
+        for col in cols:
+            for row in rows:
+                for position in self.cells.get((col, row), ()):
+                    left, top, right, bottom = self.bounds[position]
+                    if left <= q_right and q_left <= right and top <= q_bottom and q_top <= bottom:
+                        found.add(position)
+        return [self.entries[position] for position in sorted(found)]
+
+
+class OverlayManager:
+    # Owns the switch and PLL overlay items of one scene. Each overlay asset is parsed once into a
+    # shared QSvgRenderer and each hotspot's item is created once; state changes only swap the
+    # renderer or brush and toggle visibility, so no scene items are added or removed.
+    SWITCH_ASSETS = {SwitchPosition.UP: "switch_up.svg", SwitchPosition.DOWN: "switch_down.svg"}
+    PLL_BRUSHES = {
+        PllState.ENABLED: QColor(144, 238, 144), # Lighter Green
+        PllState.DISABLED: QColor("red"), # Red for disabled
+    }
+    PLL_DOT_SIZE = 8
+    Z_VALUE = 10
+
+    def __init__(self, scene, hotspots, asset_dir=""):
+        self.scene = scene
+        self.hotspots = hotspots
+        self.asset_dir = asset_dir
+        self.renderers = {} # position -> shared QSvgRenderer (None if the asset is missing)
+        self.switch_items = {} # hotspot index -> QGraphicsSvgItem
+        self.pll_items = {} # hotspot index -> QGraphicsEllipseItem
+        self.brushes = {state: QBrush(color) for state, color in self.PLL_BRUSHES.items()}
+
+    def renderer_for(self, position):
+        if position not in self.renderers:
+            svg_file = os.path.join(self.asset_dir, self.SWITCH_ASSETS[position])
+            renderer = SCHEMATICS.overlay_renderer(svg_file) # Shared by every board's overlays
+            if renderer is None:
+                log.error("File not found: %s", svg_file)
+            else:
+                log.debug("Loading: %s", svg_file)
+            self.renderers[position] = renderer
+        return self.renderers[position]
+
+    def update_switch(self, index):
+        position = SwitchPosition(self.hotspots.states[index])
+        item = self.switch_items.get(index)
+        renderer = self.renderer_for(position) if position != SwitchPosition.DEFAULT else None
+        if renderer is None: # Default position (or missing asset): nothing drawn
+            if item is not None and item.isVisible():
+                item.setVisible(False)
+                PROFILER.count("overlay.hidden")
+            return
+
+        if item is None:
+            from PySide6.QtSvgWidgets import QGraphicsSvgItem # Deferred until a switch is first drawn
+            item = QGraphicsSvgItem()
+            item.setFlags(QGraphicsSvgItem.GraphicsItemFlag.ItemClipsToShape)
+            item.setZValue(self.Z_VALUE)
+            item.setPos(self.hotspots.rect(index).topLeft())
+            self.scene.addItem(item)
+            self.switch_items[index] = item
+            PROFILER.count("overlay.created")
+        if item.renderer() is not renderer:
+            item.setSharedRenderer(renderer)
+            hotspot_rect = self.hotspots.rect(index)
+            bounding_box = renderer.viewBoxF()
+            if bounding_box.width() > 0 and bounding_box.height() > 0:
+                scale_x = hotspot_rect.width() / bounding_box.width()
+                scale_y = hotspot_rect.height() / bounding_box.height()
+                item.setScale(min(scale_x, scale_y))
+        item.setVisible(True)
+
+    def update_pll(self, index):
+        state = PllState(self.hotspots.states[index])
+        item = self.pll_items.get(index)
+        if item is None:
+            hotspot_rect = self.hotspots.rect(index)
+            dot_size = self.PLL_DOT_SIZE
+            # Dot sits a small offset from the hotspot's top-left
+            dot_x = hotspot_rect.x() + (dot_size * 0.2)
+            dot_y = hotspot_rect.y() + (dot_size * 0.2)
+            item = QGraphicsEllipseItem(dot_x, dot_y, dot_size, dot_size)
+            item.setZValue(self.Z_VALUE)
+            self.scene.addItem(item)
+            self.pll_items[index] = item
+            PROFILER.count("overlay.created")
+        item.setBrush(self.brushes[state])
+
+
+# --- Device I/O ---
+# Register traffic runs on a DeviceClient worker thread that owns one persistent Modbus connection
+# (TCP or RTU over UART). Requests are queued; consecutive register writes are coalesced into
+# multi-register transactions. Results come back as Futures and, optionally, as callbacks invoked
+# on the GUI thread.
+MODBUS_READ_HOLDING_REGISTERS = 0x03
+MODBUS_WRITE_SINGLE_REGISTER = 0x06
+MODBUS_WRITE_MULTIPLE_REGISTERS = 0x10
+MODBUS_MAX_WRITE_REGISTERS = 123 # Protocol limit for one write-multiple request
+MODBUS_MAX_READ_REGISTERS = 125
+
+UART_PARITIES = {"None": "N", "Even": "E", "Odd": "O", "Mark": "M", "Space": "S"}
+
+
+class ModbusError(Exception):
+    pass
+
+
+class ModbusProtocolError(ModbusError):
+    # A reply that does not parse. Unlike an exception reply, it leaves the connection out of step
+    # with the device, so the connection is dropped.
+    pass
+
+
+def modbus_crc(data):
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return struct.pack("<H", crc)
+
+
+def _check_exception(function, pdu):
+    if not pdu:
+        raise ModbusProtocolError(f"Empty reply to function {function:#04x}")
+    if pdu[0] == function | 0x80:
+        if len(pdu) != 2:
+            raise ModbusProtocolError(f"Malformed exception reply to function {function:#04x}")
+        raise ModbusError(f"Modbus exception {pdu[1]} for function {function:#04x}")
+    if pdu[0] != function:
+        raise ModbusProtocolError(f"Unexpected function {pdu[0]:#04x} in reply to {function:#04x}")
+
+
+class ModbusTransport:
+    # Shared request helpers; subclasses implement connect/close/transact for one framing
+    def read_registers(self, address, count):
+        pdu = self.transact(struct.pack(">BHH", MODBUS_READ_HOLDING_REGISTERS, address, count))
+        _check_exception(MODBUS_READ_HOLDING_REGISTERS, pdu)
+        if len(pdu) != 2 + count * 2 or pdu[1] != count * 2:
+            raise ModbusProtocolError(f"Read of {count} registers answered with {len(pdu)} bytes")
+        return list(struct.unpack(f">{count}H", pdu[2:]))
+
+    def write_registers(self, address, values):
+        if len(values) == 1:
+            function = MODBUS_WRITE_SINGLE_REGISTER
+            request = struct.pack(">BHH", function, address, values[0])
+        else:
+            function = MODBUS_WRITE_MULTIPLE_REGISTERS
+            request = struct.pack(f">BHHB{len(values)}H", function, address, len(values),
+                                  len(values) * 2, *values)
+        reply = self.transact(request)
+        _check_exception(function, reply)
+        if len(reply) != 5: # Both write functions echo address and value/count
+            raise ModbusProtocolError(f"Write answered with {len(reply)} bytes")
+
+
+class ModbusTcpTransport(ModbusTransport):
+    def __init__(self, host, port=502, unit_id=1, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.sock = None
+        self.transaction_id = 0
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def is_open(self):
+        return self.sock is not None
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def _recv_exact(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Connection closed by device")
+            data += chunk
+        return data
+
+    def transact(self, pdu):
+        self.transaction_id = (self.transaction_id + 1) & 0xFFFF
+        self.sock.sendall(struct.pack(">HHHB", self.transaction_id, 0, len(pdu) + 1, self.unit_id) + pdu)
+        transaction_id, protocol_id, length, unit_id = struct.unpack(">HHHB", self._recv_exact(7))
+        if protocol_id != 0:
+            raise ModbusProtocolError(f"Not a Modbus reply (protocol id {protocol_id})")
+        if length < 2:
+            raise ModbusProtocolError(f"Reply length {length} is too short for a PDU")
+        reply = self._recv_exact(length - 1)
+        if transaction_id != self.transaction_id:
+            raise ModbusProtocolError("Mismatched transaction id")
+        if unit_id != self.unit_id:
+            raise ModbusProtocolError(f"Reply from unit {unit_id}, expected {self.unit_id}")
+        return reply
+
+
+class ModbusRtuTransport(ModbusTransport):
+    # Modbus RTU over a serial port. pyserial is only needed when UART is actually used;
+    # any pyserial URL works too (e.g. "socket://localhost:5020" for the stand-in in loopback.py).
+    def __init__(self, port, baudrate=9600, bytesize=8, parity="None", stopbits=1, unit_id=1, timeout=1.0):
+        self.port = port
+        self.baudrate = baudrate
+        self.bytesize = bytesize
+        self.parity = UART_PARITIES.get(parity, parity)
+        self.stopbits = stopbits
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.serial = None
+
+    def connect(self):
+        import serial # Optional dependency, only needed for UART
+        self.serial = serial.serial_for_url(
+            self.port, baudrate=self.baudrate, bytesize=self.bytesize, parity=self.parity,
+            stopbits=self.stopbits, timeout=self.timeout
+        )
+
+    def is_open(self):
+        return self.serial is not None
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+    def _read_exact(self, size):
+        data = self.serial.read(size)
+        if len(data) != size:
+            raise TimeoutError("Device did not answer in time")
+        return data
+
+    def transact(self, pdu):
+        frame = bytes([self.unit_id]) + pdu
+        self.serial.reset_input_buffer()
+        self.serial.write(frame + modbus_crc(frame))
+        header = self._read_exact(2)
+        if header[1] & 0x80:
+            rest = self._read_exact(1)
+        elif header[1] == MODBUS_READ_HOLDING_REGISTERS:
+            rest = self._read_exact(1)
+            rest += self._read_exact(rest[0])
+        else:
+            rest = self._read_exact(4)
+        crc = self._read_exact(2)
+        if modbus_crc(header + rest) != crc:
+            raise ModbusProtocolError("CRC mismatch")
+        if header[0] != self.unit_id:
+            raise ModbusProtocolError(f"Reply from unit {header[0]}, expected {self.unit_id}")
+        return header[1:] + rest
+
+
+def make_transport(settings):
+    # settings: the dict collected by MainWindow.open_comm_dialog
+    timeout = float(settings.get("timeout_ms", 1000)) / 1000.0
+    if settings.get("interface") == "uart":
+        return ModbusRtuTransport(
+            settings["port"], int(settings.get("baud_rate", 9600)), int(settings.get("data_bits", 8)),
+            settings.get("parity", "None"), float(settings.get("stop_bits", 1)),
+            int(settings.get("unit_id", 1)), timeout
+        )
+    return ModbusTcpTransport(settings["ip_address"], int(settings.get("tcp_port", 502)),
+                              int(settings.get("unit_id", 1)), timeout)
+
+
+def check_comm_settings(settings):
+    # Raises ValueError unless make_transport can build a working transport from settings; numbers
+    # may be given as strings, as the comm dialog stores them. Returns settings unchanged.
+    def check_number(key, kind, valid):
+        try:
+            value = kind(settings[key])
+        except (KeyError, TypeError, ValueError):
+            value = None
+        if value is None or not math.isfinite(value) or not valid(value):
+            raise ValueError(f"Invalid {key}: {settings.get(key)!r}")
+
+    interface = settings.get("interface")
+    if interface == "uart":
+        if not isinstance(settings.get("port"), str) or not settings["port"]:
+            raise ValueError(f"Invalid port: {settings.get('port')!r}")
+        check_number("baud_rate", int, lambda value: value > 0)
+        check_number("data_bits", int, lambda value: 5 <= value <= 8)
+        check_number("stop_bits", float, lambda value: value in (1, 1.5, 2))
+        parity = settings.get("parity")
+        if not isinstance(parity, str) or (parity not in UART_PARITIES and parity not in UART_PARITIES.values()):
+            raise ValueError(f"Invalid parity: {parity!r}, expected one of {', '.join(UART_PARITIES)}")
+    elif interface == "tcp":
+        if not isinstance(settings.get("ip_address"), str) or not settings["ip_address"]:
+            raise ValueError(f"Invalid ip_address: {settings.get('ip_address')!r}")
+        check_number("tcp_port", int, lambda value: 0 < value <= 0xFFFF)
+    else:
+        raise ValueError(f"Invalid interface: {interface!r}, expected \"uart\" or \"tcp\"")
+    check_number("unit_id", int, lambda value: 0 <= value <= 0xFF)
+    check_number("timeout_ms", float, lambda value: value > 0)
+    return settings
+
+
+def coalesce_writes(writes):
+    # [(address, [values...]), ...] in submission order -> minimal list of contiguous
+    # (address, values) runs; later writes to the same register win
+    registers = {}
+    for address, values in writes:
+        for offset, value in enumerate(values):
+            registers[address + offset] = value
+    runs = []
+    for address in sorted(registers):
+        if runs and runs[-1][0] + len(runs[-1][1]) == address and len(runs[-1][1]) < MODBUS_MAX_WRITE_REGISTERS:
+            runs[-1][1].append(registers[address])
+        else:
+            runs.append((address, [registers[address]]))
+    return runs
+
+
+class DeviceSignals(QObject):
+    # Lives on the GUI thread; the worker emits, Qt queues delivery to the GUI thread
+    callback_ready = Signal(object, object, object) # callback, result, error
+    connection_changed = Signal(bool)
+
+
+class DeviceClient:
+    # One worker thread, one persistent connection, one FIFO request queue
+    def __init__(self, transport):
+        self.transport = transport
+        self.connected = False
+        self.requests = queue.Queue()
+        self.signals = DeviceSignals()
+        self.signals.callback_ready.connect(self._run_callback)
+        self.worker = threading.Thread(target=self._run, name="DeviceClient", daemon=True)
+        self.worker.start()
+
+    @staticmethod
+    def _run_callback(callback, result, error):
+        callback(result, error)
+
+    def _submit(self, operation, args, callback):
+        future = Future()
+        start = PROFILER.begin()
+        if start is not None: # Latency as the caller sees it: queueing plus the transaction
+            future.add_done_callback(lambda f: PROFILER.end("device.request", start, "device", overlapping=True))
+        if callback is not None:
+            future.add_done_callback(lambda f: self.signals.callback_ready.emit(
+                callback, None if f.exception() else f.result(), f.exception()))
+        self.requests.put((operation, args, future))
+        return future
+
+    def read_registers(self, address, count, callback=None):
+        return self._submit("read", (address, count), callback)
+
+    def write_registers(self, address, values, callback=None):
+        return self._submit("write", (address, list(values)), callback)
+
+    def close(self):
+        self.requests.put(None)
+        self.worker.join(timeout=5)
+
+    def _ensure_connected(self):
+        if not self.connected:
+            self.transport.connect()
+            self.connected = True
+            self.signals.connection_changed.emit(True)
+
+    def _drop_connection(self):
+        self.transport.close()
+        if self.connected:
+            self.connected = False
+            self.signals.connection_changed.emit(False)
+
+    def _execute(self, function):
+        # Runs one transaction, reconnecting once if the persistent connection went stale
+        for attempt in range(2):
+            try:
+                self._ensure_connected()
+                start = PROFILER.begin()
+                try:
+                    return function()
+                finally:
+                    PROFILER.end("device.transaction", start, "device")
+            except ModbusProtocolError:
+                self._drop_connection() # Whatever is left of the reply would be read as the next one
+                raise
+            except (OSError, ConnectionError) as e:
+                self._drop_connection()
+                if attempt:
+                    raise
+                log.debug("Device connection lost (%s), reconnecting", e)
+
+    def _run(self):
+        carried = None
+        while True:
+            request = carried if carried is not None else self.requests.get()
+            carried = None
+            if request is None:
+                break
+            operation, args, future = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            if operation == "write":
+                # Pull every write already queued behind this one into the same batch
+                batch = [request]
+                while True:
+                    try:
+                        following = self.requests.get_nowait()
+                    except queue.Empty:
+                        break
+                    if following is None or following[0] != "write":
+                        carried = following # Keep ordering: handle it after this batch
+                        break
+                    if following[2].set_running_or_notify_cancel():
+                        batch.append(following)
+                try:
+                    for address, values in coalesce_writes([r[1] for r in batch]):
+                        self._execute(lambda: self.transport.write_registers(address, values))
+                except Exception as e:
+                    for r in batch:
+                        r[2].set_exception(e)
+                else:
+                    for r in batch:
+                        r[2].set_result(None)
+            else:
+                try:
+                    future.set_result(self._execute(lambda: self.transport.read_registers(*args)))
+                except Exception as e:
+                    future.set_exception(e)
+        self._drop_connection()
+
+
+def register_spans(addresses, max_gap=8, max_count=MODBUS_MAX_READ_REGISTERS):
+    # Groups register addresses into as few read requests as possible; small gaps are read through
+    spans = []
+    for address in sorted(set(addresses)):
+        if spans and address - (spans[-1][0] + spans[-1][1]) <= max_gap and address - spans[-1][0] < max_count:
+            spans[-1][1] = address - spans[-1][0] + 1
+        else:
+            spans.append([address, 1])
+    return [tuple(span) for span in spans]
+
+
+class PollerMetrics:
+    # Timing of the polling loop, in milliseconds. mean_* are exponential moving averages.
+    SMOOTHING = 0.1
+
+    def __init__(self, target_interval_ms):
+        self.target_interval_ms = target_interval_ms
+        self.cycles = 0
+        self.intervals = 0
+        self.errors = 0
+        self.last_interval_ms = self.mean_interval_ms = 0.0
+        self.last_jitter_ms = self.mean_jitter_ms = self.max_jitter_ms = 0.0
+        self.last_cost_ms = self.mean_cost_ms = self.max_cost_ms = 0.0
+        self.last_changed = 0
+
+    def record(self, interval_ms, cost_ms, changed):
+        alpha = self.SMOOTHING if self.cycles else 1.0
+        self.cycles += 1
+        self.last_changed = changed
+        self.last_cost_ms = cost_ms
+        self.mean_cost_ms += alpha * (cost_ms - self.mean_cost_ms)
+        self.max_cost_ms = max(self.max_cost_ms, cost_ms)
+        if interval_ms is not None:
+            alpha = self.SMOOTHING if self.intervals else 1.0
+            self.intervals += 1
+            jitter = abs(interval_ms - self.target_interval_ms)
+            self.last_interval_ms = interval_ms
+            self.mean_interval_ms += alpha * (interval_ms - self.mean_interval_ms)
+            self.last_jitter_ms = jitter
+            self.mean_jitter_ms += alpha * (jitter - self.mean_jitter_ms)
+            self.max_jitter_ms = max(self.max_jitter_ms, jitter)
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class StatePoller(QObject):
+    # Reads every monitored register in bulk at a fixed rate on its own thread and emits only the
+    # hotspots whose hardware state differs from the model, so an idle board costs no repaints.
+    states_changed = Signal(object, object, int) # hotspot indices, new states, hotspots.edits when read
+    frequency_changed = Signal(int) # kHz
+    metrics_updated = Signal(object) # PollerMetrics
+
+    MAX_STATE = {HotspotType.SWITCH: max(SwitchPosition), HotspotType.PLL_CONTROL: max(PllState)}
+
+    def __init__(self, device, hotspots, interval_ms=100, parent=None):
+        super().__init__(parent)
+        self.device = device
+        self.hotspots = hotspots
+        self.interval_ms = interval_ms
+        self.metrics = PollerMetrics(interval_ms)
+
+        monitored = np.isin(hotspots.types, list(self.MAX_STATE)) & (hotspots.registers >= 0)
+        self.indices = np.flatnonzero(monitored)
+        self.addresses = hotspots.registers[self.indices]
+        self.max_states = np.array([self.MAX_STATE[HotspotType(t)] for t in hotspots.types[self.indices]],
+                                   dtype=np.int64)
+        frequency = np.flatnonzero((hotspots.types == HotspotType.FREQUENCY) & (hotspots.registers >= 0))
+        self.frequency_register = int(hotspots.registers[frequency[0]]) if len(frequency) else None
+        self.last_frequency = None
+
+        addresses = self.addresses.tolist()
+        if self.frequency_register is not None:
+            addresses += [self.frequency_register, self.frequency_register + 1]
+        self.spans = register_spans(addresses)
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def set_interval(self, interval_ms):
+        self.interval_ms = interval_ms
+        self.metrics.target_interval_ms = interval_ms
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="StatePoller", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def poll_once(self):
+        # One bulk read + diff; returns the number of hotspots that changed
+        edits = self.hotspots.edits # Before the reads are queued: later edits may not be in them
+        futures = [(start, self.device.read_registers(start, count)) for start, count in self.spans]
+        values = {}
+        for start, future in futures:
+            for offset, value in enumerate(future.result()):
+                values[start + offset] = value
+
+        states = np.fromiter((values[a] for a in self.addresses.tolist()), dtype=np.int64, count=len(self.addresses))
+        current = self.hotspots.states[self.indices]
+        changed = (states != current) & (states <= self.max_states) # Ignore out-of-range register values
+        if changed.any():
+            self.states_changed.emit(self.indices[changed], states[changed].astype(np.int8), edits)
+
+        if self.frequency_register is not None:
+            khz = (values[self.frequency_register] << 16) | values[self.frequency_register + 1]
+            if khz != self.last_frequency:
+                self.last_frequency = khz
+                self.frequency_changed.emit(khz)
+        return int(changed.sum())
+
+    def _run(self):
+        previous_start = None
+        while not self._stop.is_set():
+            cycle_start = time.perf_counter()
+            try:
+                changed = self.poll_once()
+            except Exception as e:
+                self.metrics.errors += 1
+                log.error("State poll failed: %s", e)
+                changed = 0
+            cost_ms = (time.perf_counter() - cycle_start) * 1e3
+            interval_ms = (cycle_start - previous_start) * 1e3 if previous_start is not None else None
+            previous_start = cycle_start
+            self.metrics.record(interval_ms, cost_ms, changed)
+            self.metrics_updated.emit(self.metrics)
+            # Sleep the remainder of the period so the rate does not drift with the cycle cost
+            self._stop.wait(max(0.0, self.interval_ms / 1e3 - (time.perf_counter() - cycle_start)))
+
+
+DEFAULT_COMM_SETTINGS = {
+    "interface": "uart",
+    "port": "COM1", "baud_rate": "9600", "data_bits": "8", "parity": "None", "stop_bits": "1",
+    "ip_address": "192.168.0.100", "tcp_port": 502, "unit_id": 1, "timeout_ms": 1000,
+}
+
+
+def parse_frequency_khz(text):
+    # "13.560 MHz" / "13.56" (MHz) -> 13560; raises ValueError for anything the 32-bit kHz register can't hold
+    value = float(text.strip().lower().replace("mhz", "").strip())
+    if not math.isfinite(value) or not 0 <= round(value * 1000) <= 0xFFFFFFFF:
+        raise ValueError(f"Frequency out of range: {text}")
+    return int(round(value * 1000))
+
+
+def format_frequency(khz):
+    return f"{khz / 1000:.3f} MHz"
+
+
+# --- Batch mode ---
+# Pushes a known configuration to many fixtures without a GUI: `python test.py batch ...` or
+# configure_fixtures() from a script. Fixtures are described by the same dicts that
+# MainWindow.open_comm_dialog builds, and states come from the same settings files.
+def settings_writes(hotspots, settings):
+    # Register writes that put a device into the given settings, as coalesced (address, values) runs
+    indices, states = hotspots.parse_states(settings.get("states", {}))
+    registers = hotspots.registers[indices]
+    writes = [(register, [state]) for register, state in zip(registers.tolist(), states.tolist()) if register >= 0]
+    if settings.get("frequency"):
+        khz = parse_frequency_khz(settings["frequency"])
+        for index in hotspots.indices_of(HotspotType.FREQUENCY).tolist():
+            if hotspots.registers[index] >= 0:
+                # 32-bit frequency in kHz, high word first
+                writes.append((int(hotspots.registers[index]), [khz >> 16, khz & 0xFFFF]))
+    return coalesce_writes(writes)
+
+
+def fixture_link(settings):
+    # The bus a fixture sits on: fixtures sharing a serial port (RS-485 drop) or a TCP gateway
+    # have to take turns, fixtures on different links can be configured at the same time
+    if settings.get("interface") == "uart":
+        return f"uart:{settings['port']}"
+    return f"tcp:{settings['ip_address']}:{settings.get('tcp_port', 502)}"
+
+
+def configure_fixture(settings, writes, verify=False, transport=None):
+    # Connects, writes, optionally reads every run back, and reports what happened and how long it
+    # took. Fixtures on one link pass the same transport along, so its connection is reused.
+    result = fixture_result(settings)
+    start = time.perf_counter()
+    owned = transport is None
+    try:
+        if owned:
+            transport = make_transport(settings)
+        transport.unit_id = int(settings.get("unit_id", 1))
+        if not transport.is_open():
+            transport.connect()
+        connected = time.perf_counter()
+        result["connect_ms"] = (connected - start) * 1e3
+        for address, values in writes:
+            transport.write_registers(address, values)
+            result["transactions"] += 1
+        written = time.perf_counter()
+        result["write_ms"] = (written - connected) * 1e3
+        if verify:
+            for address, values in writes:
+                result["transactions"] += 1
+                if transport.read_registers(address, len(values)) != values:
+                    raise ModbusError(f"Read-back mismatch at register {address}")
+            result["verify_ms"] = (time.perf_counter() - written) * 1e3
+        result["ok"] = True
+    except ImportError:
+        result["error"] = "pyserial is required for UART fixtures"
+    except Exception as e: # Timeouts and refused connections are OSErrors; anything else fails this fixture only
+        result["error"] = str(e) or type(e).__name__
+        if transport is not None:
+            transport.close() # The next fixture on this link starts from a fresh connection
+    finally:
+        if owned and transport is not None:
+            transport.close()
+        result["total_ms"] = (time.perf_counter() - start) * 1e3
+    return result
+
+
+def fixture_result(settings, error=None):
+    # The per-fixture record configure_fixture fills in; error marks a fixture that was never attempted
+    return {"name": settings.get("name") or fixture_link(settings), "link": fixture_link(settings),
+            "unit_id": settings.get("unit_id", 1), "ok": False, "error": error, "transactions": 0,
+            "connect_ms": 0.0, "write_ms": 0.0, "verify_ms": 0.0, "total_ms": 0.0}
+
+
+def configure_fixtures(fixtures, hotspots, settings, max_parallel=8, verify=False, progress=None):
+    # Configures every fixture and returns one result per fixture, in input order. Links run in
+    # parallel (at most max_parallel at once); fixtures on the same link run one after another.
+    # A fixture may carry its own "settings" dict in place of the shared one. Whatever goes wrong
+    # with one fixture is reported in its result; the others are still configured.
+    results = [None] * len(fixtures)
+    writes = [None] * len(fixtures)
+    links = OrderedDict()
+    for i, fixture in enumerate(fixtures):
+        try:
+            writes[i] = settings_writes(hotspots, fixture.get("settings", settings))
+        except ValueError as e: # Settings naming hotspots or states this layout does not have
+            results[i] = fixture_result(fixture, str(e))
+            if progress is not None:
+                progress(results[i])
+            continue
+        links.setdefault(fixture_link(fixture), []).append(i)
+
+    def run_link(indices):
+        try:
+            transport = make_transport(fixtures[indices[0]])
+        except Exception:
+            transport = None # Each fixture then tries on its own and reports why it failed
+        try:
+            for i in indices:
+                results[i] = configure_fixture(fixtures[i], writes[i], verify, transport)
+                if progress is not None:
+                    progress(results[i])
+        finally:
+            if transport is not None:
+                transport.close()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(links)))) as pool:
+        list(pool.map(run_link, links.values())) # list() re-raises anything unexpected
+    return results
+
+
+def load_fixtures(path):
+    # Fixtures file: {"fixtures": [{"name": "Jig 1", "interface": "tcp", "ip_address": ..., ...}, ...]};
+    # missing communication fields take the dialog defaults, "settings" may name a per-fixture file
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    fixtures = []
+    for n, entry in enumerate(data["fixtures"] if isinstance(data, dict) else data, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Fixture {n} must be an object")
+        fixture = dict(DEFAULT_COMM_SETTINGS, **entry)
+        try:
+            check_comm_settings(fixture)
+        except ValueError as e:
+            raise ValueError(f"Fixture {fixture.get('name') or n}: {e}") from None
+        if isinstance(fixture.get("settings"), str):
+            fixture["settings"] = load_settings(os.path.join(os.path.dirname(os.path.abspath(path)), fixture["settings"]))
+        elif "settings" in fixture:
+            check_settings(fixture["settings"])
+        fixtures.append(fixture)
+    return fixtures
+
+
+def batch_main(argv):
+    import argparse # Only the batch entry point parses arguments
+
+    parser = argparse.ArgumentParser(prog="test.py batch", description="Configure fixtures without the GUI")
+    parser.add_argument("fixtures", help="fixtures JSON file (communication settings per fixture)")
+    parser.add_argument("settings", help="settings file to push (states and frequency)")
+    parser.add_argument("--hotspots", default="hotspots.json", help="hotspot layout with register addresses")
+    parser.add_argument("--jobs", type=int, default=8, help="links configured in parallel (default: 8)")
+    parser.add_argument("--verify", action="store_true", help="read every written register back")
+    parser.add_argument("--output", help="write the per-fixture results as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        hotspots = HotspotModel.load(args.hotspots)
+        settings = load_settings(args.settings)
+        settings_writes(hotspots, settings) # Names unknown hotspots or states: nothing to push anywhere
+        fixtures = load_fixtures(args.fixtures)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 2
+
+    def report(result):
+        status = "OK  " if result["ok"] else "FAIL"
+        detail = f"{result['transactions']} transactions" if result["ok"] else result["error"]
+        print(f"[{status}] {result['name']:<20} {result['link']:<28} connect {result['connect_ms']:7.1f} ms  "
+              f"write {result['write_ms']:7.1f} ms  verify {result['verify_ms']:7.1f} ms  "
+              f"total {result['total_ms']:7.1f} ms  {detail}", flush=True)
+
+    start = time.perf_counter()
+    results = configure_fixtures(fixtures, hotspots, settings, args.jobs, args.verify, report)
+    elapsed = time.perf_counter() - start
+    succeeded = sum(result["ok"] for result in results)
+    print(f"Configured {succeeded}/{len(results)} fixtures in {elapsed * 1e3:.0f} ms "
+          f"({len(results) / elapsed:.1f} fixtures/s, {len({r['link'] for r in results})} links, {args.jobs} jobs)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_ms": elapsed * 1e3, "results": results}, f, indent=2)
+    return 0 if succeeded == len(results) else 1
+
+
 class SvgViewer(QGraphicsView):
-    def __init__(self, svg_path):
+    schematic_loaded = Signal()
+
+    def __init__(self, svg_path=None, hotspots_path="hotspots.json"):
         super().__init__()
         self.setRenderHints(self.renderHints() |
                             QPainter.Antialiasing |
@@ -23,8 +2039,24 @@ class SvgViewer(QGraphicsView):
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
 
-        self.svg_item = QGraphicsSvgItem(svg_path)
-        self.scene.addItem(self.svg_item)
+        # The schematic is the view's background, drawn straight from the cached raster tiles (see
+        # TiledSvgLayer) for just the region being repainted. Scrolling shifts the viewport and paints
+        # only the exposed strips, and a landed tile invalidates only its own rect. Scene items are
+        # just the overlays, so a switch toggle repaints the switch and nothing else. (CacheBackground
+        # is left off: at fractional zoom its scrolled pixmap smears and double-draws edges.)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+
+        # Given a compiled svg_path the schematic is set up right away, otherwise load_schematic()
+        # fills it in from a background thread while the window is already up.
+        self.svg_layer = None
+        self.placeholder = None
+        self.load_pool = QThreadPool(self)
+        self.load_pool.setMaxThreadCount(1)
+        self.load_signals = SchematicLoadSignals(self)
+        self.load_signals.loaded.connect(self.set_schematic)
+        self.load_signals.failed.connect(self.on_schematic_failed)
+        if svg_path is not None:
+            self.set_schematic(svg_path, build_lod_documents(svg_path))
 
         # self.setDragMode(QGraphicsView.ScrollHandDrag) # Removed or commented out to implement custom left-click panning
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -33,80 +2065,265 @@ class SvgViewer(QGraphicsView):
         self.min_scale = 0.1
         self.max_scale = 10.0
 
-        # Hotspots - list of dictionaries
-        self.hotspots_data = [
-            # Original switches (now with 'current_position' state)
-            {"rect": QRectF(262.5, 392.269, 20.026, 20.026), "type": "switch", "name": "Switch 1", "current_position": "default"},
-            {"rect": QRectF(284.528, 364.949, 20.026, 20.026), "type": "switch", "name": "Switch 2", "current_position": "default"},
-            {"rect": QRectF(321.788, 337.689, 20.026, 20.026), "type": "switch", "name": "Switch 3", "current_position": "default"},
-            # UPDATED Switch 4 coordinates
-            {"rect": QRectF(293.538, 264.652 ,20.026, 20.026), "type": "switch", "name": "Switch 4", "current_position": "default"},
-            {"rect": QRectF(225.748, 219.489, 20.026, 20.026), "type": "switch", "name": "Switch 5", "current_position": "default"},
-            {"rect": QRectF(226.748, 259.489, 20.026, 20.026), "type": "switch", "name": "Switch 6", "current_position": "default"},
-            {"rect": QRectF(228.748, 300.489, 20.026, 20.026), "type": "switch", "name": "Switch 7", "current_position": "default"},
-            {"rect": QRectF(353.748, 265.489, 20.026, 20.026), "type": "switch", "name": "Switch 8", "current_position": "default"},
-            # {"rect": QRectF(236.93, 268.489, 20.026, 20.026), "type": "switch", "name": "Switch 6", "current_position": "default"},
-            {"rect": QRectF(525.50, 308.99, 20.026, 20.026), "type": "switch", "name": "Switch 9", "current_position": "default"},
-            {"rect": QRectF(693.50, 303.99, 19.026, 29.026), "type": "switch", "name": "Switch 10", "current_position": "default"},
-            {"rect": QRectF(810.50, 303.99, 19.026, 29.026), "type": "switch", "name": "Switch 11", "current_position": "default"},
-            {"rect": QRectF(840.50, 308.99, 20.026, 20.026), "type": "switch", "name": "Switch 12", "current_position": "default"},
-            {"rect": QRectF(880.50, 230.99, 20.026, 20.026), "type": "switch", "name": "Switch 13", "current_position": "default"},
-            {"rect": QRectF(911.50, 260.99, 20.026, 20.026), "type": "switch", "name": "Switch 14", "current_position": "default"},
-            {"rect": QRectF(940.50, 261.99, 20.026, 29.026), "type": "switch", "name": "Switch 15", "current_position": "default"},
-            {"rect": QRectF(889.50, 406.99, 20.026, 20.026), "type": "switch", "name": "Switch 16", "current_position": "default"},
-            {"rect": QRectF(914.50, 371.99, 20.026, 20.026), "type": "switch", "name": "Switch 17", "current_position": "default"},
-            {"rect": QRectF(944.50, 364.99, 20.026, 29.026), "type": "switch", "name": "Switch 18", "current_position": "default"},
-            
-            # Frequency hotspot: User needs to provide Inkscape values for this one as well if it's off
-            {"rect": QRectF(582.658, 317.621 - (45.508 / 2), 85.789, 45.508), "type": "frequency", "name": "Frequency Settings"},
-            
-            # Example hotspot (remains unchanged - user can remove or update with Inkscape values)
-            {"rect": QRectF(100, 100, 50, 50), "type": "example", "name": "Example Hotspot"},
-            
-            # PLL control hotspot (existing, now with 'current_state')
-            {"rect": QRectF(477.498, 280.155 - (24.621 / 2), 46.104, 24.621), "type": "pll_control", "name": "PLL Control 1", "current_state": "disabled"},
-            # NEW PLL control hotspot
-            {"rect": QRectF(725.358, 208.405 - (24.621 / 2), 46.104, 24.621), "type": "pll_control", "name": "PLL Control 2", "current_state": "disabled"},
-            # NEW PLL control hotspot (from the last request)
-            {"rect": QRectF(729.258, 437.175 - (24.621 / 2), 46.104, 24.621), "type": "pll_control", "name": "PLL Control 3", "current_state": "disabled"},
-        ]
+        # Hotspots - columnar model loaded from the board's data file
+        self.hotspots = HotspotModel.load(hotspots_path)
+        # User edits go through the history so they can be undone; see edit_states
+        self.history = HotspotHistory(self.hotspots)
+
+        # Last frequency selected or loaded for the "Frequency Settings" hotspot
+        self.frequency = None
+
+        # Communication settings of this board's jig, and the DeviceClient and StatePoller that
+        # MainWindow opens from them
+        self.comm_settings = dict(DEFAULT_COMM_SETTINGS)
+        self.device = None
+        self.poller = None
 
         # Offset for non-switch hotspots to adjust clicking position
         self.non_switch_hotspot_offset_x = 0.0
         self.non_switch_hotspot_offset_y = 0.0
 
-        # Overlay switch states - now a dictionary for individual tracking
-        self.switch_overlay_items = {}
+        # Spatial index used for hit-testing; rebuild it whenever hotspots or offsets change
+        self.hotspot_index = HotspotGridIndex()
+        self.rebuild_hotspot_index()
+
+        # Switch and PLL overlays are created once and restyled in place; see OverlayManager
+        self.overlays = OverlayManager(self.scene, self.hotspots)
+
+        # Overlay switch states - dictionary keyed by hotspot index
+        self.switch_overlay_items = self.overlays.switch_items
         
-        # PLL dot overlays - now a dictionary for individual tracking
-        self.pll_dot_items = {}
+        # PLL dot overlays - dictionary keyed by hotspot index
+        self.pll_dot_items = self.overlays.pll_items
 
         # Panning variables
         self.panning = False
         self.last_mouse_pos = QPointF()
 
+        # Frame-time read-out, shown while profiling is on and the view is; see set_profiling
+        self.profiling = False
+        self.profiler_hud = None
+
         # Initialize switch and PLL overlays based on their initial state
-        for hotspot_data in self.hotspots_data:
-            if hotspot_data["type"] == "switch":
-                if hotspot_data["current_position"] != "default":
-                    self.update_switch_overlay(hotspot_data)
-            elif hotspot_data["type"] == "pll_control":
-                # Call update for PLL controls to show initial (red) state
-                self.update_pll_dot_overlay(hotspot_data)
+        switch_indices, switch_positions = self.hotspots.states_of(HotspotType.SWITCH)
+        for index in switch_indices[switch_positions != SwitchPosition.DEFAULT]:
+            self.update_switch_overlay(int(index))
+        for index in self.hotspots.indices_of(HotspotType.PLL_CONTROL):
+            # Call update for PLL controls to show initial (red) state
+            self.update_pll_dot_overlay(int(index))
 
         # --- ADD THIS CODE TO HIGHLIGHT A SPECIFIC HOTSPOT ---
-        for hotspot_data in self.hotspots_data:
-            if hotspot_data["name"] == "Switch 1":
-                highlight_rect = QGraphicsRectItem(hotspot_data["rect"])
-                highlight_rect.setBrush(QBrush(QColor(255, 0, 0, 100))) # Red with 100 alpha (transparency)
-                highlight_rect.setPen(QPen(QColor(255, 0, 0), 2)) # Red border, 2 pixels wide
-                highlight_rect.setZValue(9) # Place it below overlays (ZValue 10) but above the SVG (ZValue 0 implicitly)
-                self.scene.addItem(highlight_rect)
-                break # Found Switch 1, no need to check others
+        switch_1 = self.hotspots.index.get("Switch 1")
+        if switch_1 is not None:
+            highlight_rect = QGraphicsRectItem(self.hotspots.rect(switch_1))
+            highlight_rect.setBrush(QBrush(QColor(255, 0, 0, 100))) # Red with 100 alpha (transparency)
+            highlight_rect.setPen(QPen(QColor(255, 0, 0), 2)) # Red border, 2 pixels wide
+            highlight_rect.setZValue(9) # Place it below overlays (ZValue 10) but above the SVG (ZValue 0 implicitly)
+            self.scene.addItem(highlight_rect)
         # --- END OF ADDED CODE ---
 
 
+    def load_schematic(self, source_path):
+        # Returns immediately; schematic_loaded is emitted once the tiles can be drawn
+        self.show_placeholder("Loading schematic...")
+        self.load_pool.start(SchematicLoadJob(self.load_signals, source_path))
+
+    def set_schematic(self, svg_path, lod_documents=None, bounds=None, preview=None):
+        if self.svg_layer is not None:
+            self.svg_layer.shutdown()
+            self.svg_layer.deleteLater()
+        self.svg_layer = TiledSvgLayer(svg_path, lod_documents, bounds, preview, parent=self)
+        self.svg_layer.updated.connect(self.invalidate_background)
+        self.show_placeholder(None)
+        # Not an item, so the scene no longer grows to the schematic's bounds by itself
+        self.scene.setSceneRect(self.svg_layer.bounds.united(self.scene.itemsBoundingRect()))
+        self.viewport().update()
+        self.schematic_loaded.emit()
+
+    def invalidate_background(self, scene_rect):
+        # Repaints just that part of the viewport on the next paint
+        self.invalidateScene(scene_rect, QGraphicsScene.BackgroundLayer)
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        if self.svg_layer is not None:
+            self.svg_layer.paint(painter, rect)
+
+    def on_schematic_failed(self, message):
+        log.error("Could not load schematic: %s", message)
+        self.show_placeholder(f"Could not load schematic\n{message}")
+
+    def show_placeholder(self, text):
+        # Text shown in place of the schematic while it loads (None removes it)
+        if self.placeholder is not None:
+            self.scene.removeItem(self.placeholder)
+            self.placeholder = None
+        if text is not None:
+            self.placeholder = self.scene.addText(text)
+
+    def shutdown(self):
+        # Lets background loading finish and gives the schematic back to the shared registry
+        self.load_pool.waitForDone()
+        if self.svg_layer is not None:
+            self.svg_layer.shutdown()
+
+    def hideEvent(self, event):
+        # A board in a background tab is the first to give up its tiles when memory runs short.
+        # Deferred: on a tab switch the old page hides before the new one shows, and both may
+        # share a schematic.
+        super().hideEvent(event)
+        QTimer.singleShot(0, SCHEMATICS.trim)
+        if self.profiler_hud is not None:
+            self.profiler_hud.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.profiling:
+            self.profiler_hud.start()
+
+    def rebuild_hotspot_index(self):
+        # Offset applies only to non-switch hotspots
+        self.hotspot_index.build(self.hotspots.hit_rects(
+            self.non_switch_hotspot_offset_x, self.non_switch_hotspot_offset_y))
+
+    def set_switch_positions(self, position, indices=None):
+        # Bulk switch update (e.g. all switches to RF1); only changed switches are redrawn
+        if indices is None:
+            indices = self.hotspots.indices_of(HotspotType.SWITCH)
+        for index in self.hotspots.set_states(indices, position):
+            self.update_switch_overlay(int(index))
+
+    def set_pll_states(self, state, indices=None):
+        if indices is None:
+            indices = self.hotspots.indices_of(HotspotType.PLL_CONTROL)
+        for index in self.hotspots.set_states(indices, state):
+            self.update_pll_dot_overlay(int(index))
+
+    def pll_states(self):
+        return self.hotspots.states_of(HotspotType.PLL_CONTROL)
+
+    def update_overlay(self, index):
+        hotspot_type = self.hotspots.type_of(index)
+        if hotspot_type == HotspotType.SWITCH:
+            self.update_switch_overlay(index)
+        elif hotspot_type == HotspotType.PLL_CONTROL:
+            self.update_pll_dot_overlay(index)
+
+    def apply_settings(self, settings):
+        # Applies a parsed settings dict as one undoable edit; only hotspots whose state differs
+        # are touched. Returns the indices that changed.
+        indices, states = self.hotspots.parse_states(settings.get("states", {}))
+        khz = parse_frequency_khz(settings["frequency"]) if settings.get("frequency") else None
+        return self.edit_states(indices, states, khz)
+
+    def edit_states(self, indices, states, frequency=None):
+        # A user edit: recorded in the history, drawn, and written to the device. frequency (kHz)
+        # is optional and part of the same edit.
+        previous = parse_frequency_khz(self.frequency) if self.frequency else None
+        changed = self.push_changes(self.history.record(indices, states, frequency, previous))
+        if frequency is not None and frequency != previous:
+            self.push_frequency(frequency)
+        return changed
+
+    def undo(self):
+        if not self.history.can_undo():
+            return np.empty(0, dtype=np.intp)
+        return self.revert_to(self.history.revision - 1)
+
+    def redo(self):
+        if not self.history.can_redo():
+            return np.empty(0, dtype=np.intp)
+        return self.revert_to(self.history.revision + 1)
+
+    def revert_to(self, revision):
+        # Back (or forward) to an earlier snapshot, e.g. the revision a jig profile was loaded at
+        khz = self.history.frequency_change(self.history.revision, revision)
+        changed = self.push_changes(self.history.checkout(revision))
+        if khz is not None:
+            self.push_frequency(khz)
+        return changed
+
+    def push_frequency(self, khz):
+        self.frequency = format_frequency(khz)
+        self.write_frequency(khz)
+
+    def push_changes(self, changed):
+        # Redraws and writes only the hotspots whose state changed. Overlay updates never move an
+        # item, so the scene index is left alone, and their repaints merge into one paint of the
+        # changed hotspot rects.
+        if len(changed) == 0:
+            return changed
+        self.hotspots.mark_edited(changed)
+        for index in changed.tolist():
+            self.update_overlay(index)
+        self.write_hotspot_states(changed)
+        return changed
+
+    def write_hotspot_states(self, indices):
+        # Queues the states of the given hotspots to the device; adjacent registers are coalesced
+        if self.device is None:
+            return
+        indices = np.asarray(indices, dtype=np.intp)
+        indices = indices[self.hotspots.registers[indices] >= 0]
+        for register, state in zip(self.hotspots.registers[indices].tolist(), self.hotspots.states[indices].tolist()):
+            self.device.write_registers(register, [state], callback=self.on_device_reply)
+
+    def write_frequency(self, khz, indices=None):
+        # Queues a frequency to the given frequency hotspots (all of them by default), the same
+        # two-register write settings_writes() makes in batch mode
+        if self.device is None:
+            return
+        if indices is None:
+            indices = self.hotspots.indices_of(HotspotType.FREQUENCY)
+        for register in self.hotspots.registers[indices].tolist():
+            if register >= 0:
+                # 32-bit frequency in kHz, high word first
+                self.device.write_registers(register, [khz >> 16, khz & 0xFFFF], callback=self.on_device_reply)
+
+    def apply_polled_states(self, indices, states, edits):
+        # Slot for StatePoller.states_changed: mirror hardware without writing back to it. Hotspots
+        # edited after the poll started are skipped: the read may have reached the device before
+        # the write did, and the next poll reports them again if the write really failed to stick.
+        indices = np.asarray(indices, dtype=np.intp)
+        current = ~self.hotspots.edited_since(edits, indices)
+        changed = self.hotspots.set_states(indices[current], states[current])
+        for index in changed.tolist():
+            self.update_overlay(index)
+
+    def apply_polled_frequency(self, khz):
+        self.frequency = format_frequency(khz)
+
+    def on_device_reply(self, result, error):
+        # Runs on the GUI thread for every device request issued by the viewer
+        if error is not None:
+            log.error("Device request failed: %s", error)
+
+    def apply_settings_file(self, path):
+        return self.apply_settings(load_settings(path))
+
+    def hotspot_at(self, scene_pos):
+        return self.hotspot_index.query_point(scene_pos)
+
+    def hotspots_in_rect(self, scene_rect):
+        return self.hotspot_index.query_rect(scene_rect)
+
+    def set_profiling(self, enabled):
+        PROFILER.set_enabled(enabled)
+        self.profiling = enabled
+        if enabled and self.profiler_hud is None:
+            self.profiler_hud = ProfilerHud(self)
+        if enabled and self.isVisible():
+            self.profiler_hud.start()
+        elif self.profiler_hud is not None:
+            self.profiler_hud.stop()
+
+    def paintEvent(self, event):
+        start = PROFILER.begin()
+        super().paintEvent(event)
+        PROFILER.end("paint", start, "paint")
+
     def wheelEvent(self, event):
+        start = PROFILER.begin()
         zoom_in_factor = 1.25
         zoom_out_factor = 1 / zoom_in_factor
 
@@ -119,36 +2336,22 @@ class SvgViewer(QGraphicsView):
         if self.min_scale <= new_scale <= self.max_scale:
             self.scale(zoom, zoom)
             self.scale_factor = new_scale
+        PROFILER.end("wheelEvent", start, "input")
 
     def mousePressEvent(self, event):
         scene_pos = self.mapToScene(event.pos())
 
         if event.button() == Qt.RightButton:
-            hotspot_found = False
-            for hotspot_data in self.hotspots_data:
-                current_hotspot_rect = hotspot_data["rect"]
-
-                # Apply offset only to non-switch hotspots
-                if hotspot_data["type"] != "switch":
-                    current_hotspot_rect = QRectF(
-                        hotspot_data["rect"].x() + self.non_switch_hotspot_offset_x,
-                        hotspot_data["rect"].y() + self.non_switch_hotspot_offset_y,
-                        hotspot_data["rect"].width(),
-                        hotspot_data["rect"].height()
-                    )
-
-                if current_hotspot_rect.contains(scene_pos):
-                    hotspot_found = True
-                    if hotspot_data["type"] == "switch":
-                        # Pass the entire hotspot_data for this specific switch
-                        self.show_switch_dialog(scene_pos, hotspot_data)
-                    elif hotspot_data["type"] == "frequency":
-                        self.show_frequency_dialog(scene_pos)
-                    elif hotspot_data["type"] == "pll_control":
-                        # Pass the entire hotspot_data for this specific PLL
-                        self.show_pll_dialog(scene_pos, hotspot_data)
-                    break # Exit loop once a hotspot is found
-            if not hotspot_found: # Only call super if no hotspot was clicked
+            index = self.hotspot_at(scene_pos)
+            if index is not None:
+                hotspot_type = self.hotspots.type_of(index)
+                if hotspot_type == HotspotType.SWITCH:
+                    self.show_switch_dialog(scene_pos, index)
+                elif hotspot_type == HotspotType.FREQUENCY:
+                    self.show_frequency_dialog(scene_pos, index)
+                elif hotspot_type == HotspotType.PLL_CONTROL:
+                    self.show_pll_dialog(scene_pos, index)
+            else: # Only call super if no hotspot was clicked
                 super().mousePressEvent(event)
         elif event.button() == Qt.LeftButton:
             self.panning = True
@@ -159,6 +2362,7 @@ class SvgViewer(QGraphicsView):
             super().mousePressEvent(event) # Call super for other buttons
 
     def mouseMoveEvent(self, event):
+        start = PROFILER.begin()
         if self.panning and event.buttons() & Qt.LeftButton:
             delta = event.pos() - self.last_mouse_pos
             self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
@@ -167,6 +2371,7 @@ class SvgViewer(QGraphicsView):
             event.accept()
         else:
             super().mouseMoveEvent(event)
+        PROFILER.end("mouseMoveEvent", start, "input")
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton and self.panning:
@@ -176,54 +2381,25 @@ class SvgViewer(QGraphicsView):
         else:
             super().mouseReleaseEvent(event)
 
-    # show_switch_dialog now accepts hotspot_data
-    def show_switch_dialog(self, scene_pos, hotspot_data):
+    # show_switch_dialog accepts the hotspot index
+    def show_switch_dialog(self, scene_pos, index):
         menu = QMenu(self)
         up_action = menu.addAction("RF2")
         down_action = menu.addAction("RF1")
 
         selected_action = menu.exec(self.viewport().mapToGlobal(self.mapFromScene(scene_pos)))
         if selected_action == up_action:
-            hotspot_data["current_position"] = "up" # Update the state for this specific switch
-            self.update_switch_overlay(hotspot_data) # Pass the full data to update overlay
+            self.edit_states([index], SwitchPosition.UP) # Update the state for this specific switch
         elif selected_action == down_action:
-            hotspot_data["current_position"] = "down" # Update the state for this specific switch
-            self.update_switch_overlay(hotspot_data) # Pass the full data to update overlay
-
-    # update_switch_overlay now accepts hotspot_data
-    def update_switch_overlay(self, hotspot_data):
-        switch_name = hotspot_data["name"]
-        position = hotspot_data["current_position"]
-        hotspot_rect = hotspot_data["rect"]
-
-        # Remove existing overlay for this specific switch, if any
-        if switch_name in self.switch_overlay_items and self.switch_overlay_items[switch_name]:
-            self.scene.removeItem(self.switch_overlay_items[switch_name])
-            self.switch_overlay_items[switch_name] = None
-
-        if position and position != "default": # Only draw if a specific state is set
-            svg_file = f"switch_{position}.svg"
-            if not os.path.exists(svg_file):
-                print(f"[ERROR] File not found: {svg_file}")
-                return
-            print(f"[DEBUG] Loading: {svg_file} for {switch_name}")
-
-            item = QGraphicsSvgItem(svg_file)
-            item.setFlags(QGraphicsSvgItem.GraphicsItemFlag.ItemClipsToShape)
-            item.setZValue(10)
-            
-            item.setPos(hotspot_rect.topLeft())
-
-            bounding_box = item.renderer().viewBoxF()
-            if bounding_box.width() > 0 and bounding_box.height() > 0:
-                scale_x = hotspot_rect.width() / bounding_box.width()
-                scale_y = hotspot_rect.height() / bounding_box.height()
-                item.setScale(min(scale_x, scale_y))
+            self.edit_states([index], SwitchPosition.DOWN) # Update the state for this specific switch
 
-            self.scene.addItem(item)
-            self.switch_overlay_items[switch_name] = item # Store it in the dictionary
+    # update_switch_overlay accepts the hotspot index
+    def update_switch_overlay(self, index):
+        start = PROFILER.begin()
+        self.overlays.update_switch(index)
+        PROFILER.end("overlay.update", start, "overlays")
 
-    def show_frequency_dialog(self, scene_pos):
+    def show_frequency_dialog(self, scene_pos, index):
         dialog = QDialog(self)
         dialog.setWindowTitle("Configure Frequency")
         dialog.setMinimumWidth(300)
@@ -248,12 +2424,31 @@ class SvgViewer(QGraphicsView):
         layout.addWidget(write_button)
         dialog.setLayout(layout)
 
+        register = int(self.hotspots.registers[index])
+
+        def on_read_done(values, error):
+            if error is not None:
+                self.on_device_reply(None, error)
+                return
+            self.frequency = format_frequency((values[0] << 16) | values[1])
+            custom_input.setText(self.frequency)
+
         def on_read():
-            print("Reading frequency...")
+            log.info("Reading frequency...")
+            if self.device is not None and register >= 0:
+                # 32-bit frequency in kHz, high word first
+                self.device.read_registers(register, 2, callback=on_read_done)
 
         def on_write():
             selected = custom_input.text().strip() or combo.currentText()
-            print(f"Writing frequency: {selected}")
+            log.info("Writing frequency: %s", selected)
+            try:
+                khz = parse_frequency_khz(selected)
+            except ValueError:
+                log.error("Invalid frequency: %s", selected)
+                return
+            self.frequency = format_frequency(khz)
+            self.write_frequency(khz, [index])
 
         read_button.clicked.connect(on_read)
         write_button.clicked.connect(on_write)
@@ -261,48 +2456,25 @@ class SvgViewer(QGraphicsView):
         dialog.move(self.viewport().mapToGlobal(self.mapFromScene(scene_pos)))
         dialog.exec()
 
-    # show_pll_dialog now accepts hotspot_data
-    def show_pll_dialog(self, scene_pos, hotspot_data):
+    # show_pll_dialog accepts the hotspot index
+    def show_pll_dialog(self, scene_pos, index):
         menu = QMenu(self)
         enable_action = menu.addAction("PLL Enable")
         disable_action = menu.addAction("PLL Disable")
 
         selected_action = menu.exec(self.viewport().mapToGlobal(self.mapFromScene(scene_pos)))
         if selected_action == enable_action:
-            hotspot_data["current_state"] = "enabled" # Update state for this specific PLL
-            self.update_pll_dot_overlay(hotspot_data) # Pass full data
-            print(f"{hotspot_data['name']} Enabled")
+            self.edit_states([index], PllState.ENABLED) # Update state for this specific PLL
+            log.info("%s Enabled", self.hotspots.names[index])
         elif selected_action == disable_action:
-            hotspot_data["current_state"] = "disabled" # Update state for this specific PLL
-            self.update_pll_dot_overlay(hotspot_data) # Pass full data
-            print(f"{hotspot_data['name']} Disabled")
-
-    # update_pll_dot_overlay now accepts hotspot_data
-    def update_pll_dot_overlay(self, hotspot_data):
-        pll_name = hotspot_data["name"]
-        pll_state = hotspot_data["current_state"]
-        hotspot_rect = hotspot_data["rect"]
-
-        # Remove existing overlay for this specific PLL, if any
-        if pll_name in self.pll_dot_items and self.pll_dot_items[pll_name]:
-            self.scene.removeItem(self.pll_dot_items[pll_name])
-            self.pll_dot_items[pll_name] = None
-
-        dot_size = 8
-        # Reverting to original dot position logic using a small offset from top-left
-        dot_x = hotspot_rect.x() + (dot_size * 0.2)
-        dot_y = hotspot_rect.y() + (dot_size * 0.2)
-
-        self.pll_dot_items[pll_name] = QGraphicsEllipseItem(dot_x, dot_y, dot_size, dot_size)
-        
-        # Set dot color based on PLL enabled state
-        if pll_state == "enabled":
-            self.pll_dot_items[pll_name].setBrush(QBrush(QColor(144, 238, 144))) # Lighter Green
-        else: # Default or "disabled"
-            self.pll_dot_items[pll_name].setBrush(QBrush(QColor("red")))   # Red for disabled
+            self.edit_states([index], PllState.DISABLED) # Update state for this specific PLL
+            log.info("%s Disabled", self.hotspots.names[index])
 
-        self.pll_dot_items[pll_name].setZValue(10)
-        self.scene.addItem(self.pll_dot_items[pll_name])
+    # update_pll_dot_overlay accepts the hotspot index
+    def update_pll_dot_overlay(self, index):
+        start = PROFILER.begin()
+        self.overlays.update_pll(index)
+        PROFILER.end("overlay.update", start, "overlays")
 
 
 class MainWindow(QMainWindow):
@@ -311,7 +2483,14 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("AD JIG Configurator")
         self.resize(1000, 800)
 
-        self.viewer = SvgViewer("background.svg")
+        # One tab per board (jig). Each board has its own hotspot states, communication settings
+        # and device; boards showing the same schematic share its assets through SCHEMATICS.
+        self.boards = QTabWidget()
+        self.boards.setDocumentMode(True)
+        self.boards.setTabsClosable(True)
+        self.boards.tabCloseRequested.connect(self.close_board)
+        self.boards.currentChanged.connect(self.on_board_changed)
+        self.poll_interval_ms = 100 # 10 Hz
 
         # Create Menu Bar
         menu_bar = self.menuBar()
@@ -347,6 +2526,25 @@ class MainWindow(QMainWindow):
         load_action.triggered.connect(self.open_file_dialog)
         file_menu.addAction(load_action)
 
+        # Open Board Action: another jig's schematic in a new tab
+        open_board_action = QAction("Open Board", self)
+        open_board_action.setShortcut("Ctrl+O")
+        open_board_action.triggered.connect(self.open_board_dialog)
+        file_menu.addAction(open_board_action)
+
+        # Edit Menu: undo/redo hotspot changes on the current board
+        edit_menu = menu_bar.addMenu("Edit")
+
+        undo_action = QAction("Undo", self)
+        undo_action.setShortcut("Ctrl+Z")
+        undo_action.triggered.connect(lambda: self.viewer.undo())
+        edit_menu.addAction(undo_action)
+
+        redo_action = QAction("Redo", self)
+        redo_action.setShortcuts(["Ctrl+Y", "Ctrl+Shift+Z"])
+        redo_action.triggered.connect(lambda: self.viewer.redo())
+        edit_menu.addAction(redo_action)
+
         # Settings Menu
         settings_menu = menu_bar.addMenu("Settings")
 
@@ -356,23 +2554,117 @@ class MainWindow(QMainWindow):
         comm_action.triggered.connect(self.open_comm_dialog)
         settings_menu.addAction(comm_action)
 
+        # Live Monitoring Action: poll the device and mirror its state on the schematic
+        self.monitor_action = QAction("Live Monitoring", self)
+        self.monitor_action.setCheckable(True)
+        self.monitor_action.setShortcut("Ctrl+M")
+        self.monitor_action.toggled.connect(self.set_monitoring)
+        settings_menu.addAction(self.monitor_action)
+
+        # View Menu
+        view_menu = menu_bar.addMenu("View")
+
+        # Profiling Action: frame-time HUD and hot-path timeline, off unless asked for
+        self.profiling_action = QAction("Profiling", self)
+        self.profiling_action.setCheckable(True)
+        self.profiling_action.setShortcut("Ctrl+P")
+        self.profiling_action.toggled.connect(self.set_profiling)
+        view_menu.addAction(self.profiling_action)
+
+        trace_action = QAction("Save Profiling Trace...", self)
+        trace_action.triggered.connect(self.save_trace)
+        view_menu.addAction(trace_action)
+        self.profiling_action.setChecked(os.environ.get("CONFIGURATOR_PROFILE", "") not in ("", "0"))
+
         # Removed black_bar and button_bar components from previous versions
 
         main_layout = QVBoxLayout()
         # Removed black_bar and button_bar from layout
-        main_layout.addWidget(self.viewer)
+        main_layout.addWidget(self.boards)
 
         container = QWidget()
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
+        # The schematic loads in the background so the window comes up straight away; the
+        # compiled copy, LOD layers and preview are only rebuilt when background.svg changes
+        self.open_board("background.svg", started_at=STARTED_AT)
+
+    @property
+    def viewer(self):
+        # The board in the current tab; menu actions apply to it
+        return self.boards.currentWidget()
+
+    def viewers(self):
+        return [self.boards.widget(i) for i in range(self.boards.count())]
+
+    def open_board(self, svg_path, hotspots_path="hotspots.json", started_at=None):
+        viewer = SvgViewer(hotspots_path=hotspots_path)
+        started_at = time.perf_counter() if started_at is None else started_at
+        viewer.schematic_loaded.connect(lambda: self.report_loaded(svg_path, started_at))
+        viewer.set_profiling(self.profiling_action.isChecked())
+        viewer.load_schematic(svg_path)
+        index = self.boards.addTab(viewer, os.path.splitext(os.path.basename(svg_path))[0])
+        self.boards.setTabToolTip(index, os.path.abspath(svg_path))
+        self.boards.setCurrentIndex(index)
+        return viewer
+
+    def close_board(self, index):
+        if self.boards.count() == 1:
+            return # Keep at least one board open
+        viewer = self.boards.widget(index)
+        self.disconnect_board(viewer)
+        viewer.shutdown()
+        self.boards.removeTab(index)
+        viewer.deleteLater()
+
+    def disconnect_board(self, viewer):
+        self.stop_poller(viewer)
+        if viewer.device is not None:
+            viewer.device.close()
+            viewer.device = None
+
+    def on_board_changed(self, index):
+        viewer = self.boards.widget(index)
+        if viewer is None:
+            return
+        # Reflect the current board's monitoring state without toggling it
+        self.monitor_action.blockSignals(True)
+        self.monitor_action.setChecked(viewer.poller is not None)
+        self.monitor_action.blockSignals(False)
+        self.statusBar().clearMessage()
+
+    def closeEvent(self, event):
+        for viewer in self.viewers():
+            self.disconnect_board(viewer)
+            viewer.shutdown()
+        # Stops the tile render processes
+        SCHEMATICS.shutdown()
+        super().closeEvent(event)
+
+    def open_board_dialog(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Board", "", "Schematics (*.svg);;All Files (*)")
+        if file_path:
+            # A board uses the hotspot layout file next to its schematic when there is one
+            hotspots_path = os.path.join(os.path.dirname(file_path), "hotspots.json")
+            self.open_board(file_path, hotspots_path if os.path.exists(hotspots_path) else "hotspots.json")
+
     def open_file_dialog(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Load Settings File", "", "All Files (*)")
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Load Settings File", "", "Settings Files (*.json);;All Files (*)")
         if file_path:
-            print(f"Selected file: {file_path}")
+            log.info("Selected file: %s", file_path)
+            try:
+                changed = self.viewer.apply_settings_file(file_path)
+            except (OSError, ValueError) as e: # json.JSONDecodeError is a ValueError
+                QMessageBox.warning(self, "Load Settings", f"Could not load {file_path}:\n{e}")
+                return
+            log.info("Applied settings: %d hotspot(s) changed", len(changed))
 
     
     def open_comm_dialog(self):
+        settings = self.viewer.comm_settings
         dialog = QDialog(self)
         dialog.setWindowTitle("Communication Configuration")
         dialog.setMinimumWidth(400)
@@ -384,19 +2676,25 @@ class MainWindow(QMainWindow):
         uart_form = QFormLayout()
 
         uart_port = QComboBox()
+        uart_port.setEditable(True) # Allow ports like /dev/ttyUSB0 too
         uart_port.addItems(["COM1", "COM2", "COM3", "COM4"])
+        uart_port.setCurrentText(settings["port"])
 
         uart_baud = QComboBox()
         uart_baud.addItems(["9600", "19200", "38400", "57600", "115200"])
+        uart_baud.setCurrentText(settings["baud_rate"])
 
         uart_data_bits = QComboBox()
         uart_data_bits.addItems(["5", "6", "7", "8"])
+        uart_data_bits.setCurrentText(settings["data_bits"])
 
         uart_parity = QComboBox()
         uart_parity.addItems(["None", "Even", "Odd", "Mark", "Space"])
+        uart_parity.setCurrentText(settings["parity"])
 
         uart_stop_bits = QComboBox()
         uart_stop_bits.addItems(["1", "1.5", "2"])
+        uart_stop_bits.setCurrentText(settings["stop_bits"])
 
         uart_form.addRow("Port:", uart_port)
         uart_form.addRow("Baud Rate:", uart_baud)
@@ -409,18 +2707,18 @@ class MainWindow(QMainWindow):
         eth_tab = QWidget()
         eth_form = QFormLayout()
 
-        ip_address = QLineEdit("192.168.0.100")
+        ip_address = QLineEdit(settings["ip_address"])
         port = QSpinBox()
         port.setRange(1, 65535)
-        port.setValue(502)
+        port.setValue(settings["tcp_port"])
 
         unit_id = QSpinBox()
         unit_id.setRange(1, 247)
-        unit_id.setValue(1)
+        unit_id.setValue(settings["unit_id"])
 
         timeout = QSpinBox()
         timeout.setRange(100, 10000)
-        timeout.setValue(1000)
+        timeout.setValue(settings["timeout_ms"])
 
         eth_form.addRow("IP Address:", ip_address)
         eth_form.addRow("Port:", port)
@@ -430,6 +2728,7 @@ class MainWindow(QMainWindow):
 
         tab_widget.addTab(uart_tab, "UART")
         tab_widget.addTab(eth_tab, "Ethernet")
+        tab_widget.setCurrentIndex(0 if settings["interface"] == "uart" else 1)
 
         ok_button = QPushButton("OK")
         ok_button.clicked.connect(dialog.accept)
@@ -438,9 +2737,85 @@ class MainWindow(QMainWindow):
         layout.addWidget(tab_widget)
         layout.addWidget(ok_button)
         dialog.setLayout(layout)
-        dialog.exec()
+        if dialog.exec() != QDialog.Accepted:
+            return
+
+        self.viewer.comm_settings = {
+            "interface": "uart" if tab_widget.currentIndex() == 0 else "tcp",
+            "port": uart_port.currentText(), "baud_rate": uart_baud.currentText(),
+            "data_bits": uart_data_bits.currentText(), "parity": uart_parity.currentText(),
+            "stop_bits": uart_stop_bits.currentText(),
+            "ip_address": ip_address.text().strip(), "tcp_port": port.value(),
+            "unit_id": unit_id.value(), "timeout_ms": timeout.value(),
+        }
+        self.connect_device(self.viewer, self.viewer.comm_settings)
+
+    def connect_device(self, viewer, settings):
+        # Replaces the board's device connection; the client connects lazily on its first request
+        monitoring = viewer.poller is not None
+        self.disconnect_board(viewer)
+        viewer.device = DeviceClient(make_transport(settings))
+        if monitoring:
+            self.start_poller(viewer)
+
+    def set_monitoring(self, enabled):
+        viewer = self.viewer
+        if not enabled:
+            self.stop_poller(viewer)
+            self.statusBar().clearMessage()
+        elif viewer.device is None:
+            QMessageBox.information(self, "Live Monitoring", "Configure communication first (Settings > Communication).")
+            self.monitor_action.setChecked(False)
+        else:
+            self.start_poller(viewer)
+
+    def start_poller(self, viewer):
+        viewer.poller = StatePoller(viewer.device, viewer.hotspots, self.poll_interval_ms, viewer)
+        viewer.poller.states_changed.connect(viewer.apply_polled_states)
+        viewer.poller.frequency_changed.connect(viewer.apply_polled_frequency)
+        viewer.poller.metrics_updated.connect(lambda metrics: self.show_poll_metrics(viewer, metrics))
+        viewer.poller.start()
+
+    def stop_poller(self, viewer):
+        if viewer.poller is not None:
+            viewer.poller.stop()
+            viewer.poller.deleteLater() # Takes its connections, and the viewer they hold, with it
+            viewer.poller = None
+
+    def set_profiling(self, enabled):
+        for viewer in self.viewers():
+            viewer.set_profiling(enabled)
+
+    def report_loaded(self, svg_path, started_at):
+        ready_ms = (time.perf_counter() - started_at) * 1e3
+        log.info("%s ready in %.0f ms", svg_path, ready_ms)
+        self.statusBar().showMessage(f"{os.path.basename(svg_path)} ready in {ready_ms:.0f} ms", 5000)
+
+    def save_trace(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Profiling Trace", "trace.json", "Chrome Trace Files (*.json);;All Files (*)")
+        if file_path:
+            try:
+                count = PROFILER.dump(file_path)
+            except OSError as e:
+                QMessageBox.warning(self, "Save Profiling Trace", f"Could not write {file_path}:\n{e}")
+                return
+            log.info("Wrote %d trace events to %s", count, file_path)
+
+    def show_poll_metrics(self, viewer, metrics):
+        if viewer is not self.viewer:
+            return # Background boards keep polling; only the current one reports
+        self.statusBar().showMessage(
+            f"Polling every {metrics.mean_interval_ms:.1f} ms (jitter {metrics.mean_jitter_ms:.2f} ms, "
+            f"max {metrics.max_jitter_ms:.2f} ms) - cycle {metrics.mean_cost_ms:.2f} ms - "
+            f"{metrics.last_changed} changed - {metrics.errors} errors"
+        )
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("CONFIGURATOR_LOG_LEVEL", "INFO").upper(),
+                        format="[%(levelname)s] %(message)s")
+    if sys.argv[1:2] == ["batch"]: # Headless: no QApplication, no scene
+        sys.exit(batch_main(sys.argv[2:]))
     app = QApplication(sys.argv)
     window = MainWindow()
     window.showMaximized()
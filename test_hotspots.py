@@ -0,0 +1,279 @@
+import json
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QPointF, QRectF
+
+from test import (
+    HotspotGridIndex, HotspotHistory, HotspotModel, HotspotType, PllState, SwitchPosition, check_settings,
+    load_settings
+)
+
+
+def make_board():
+    return HotspotModel.from_records([
+        {"name": "Switch 1", "type": "switch", "rect": [0, 0, 20, 20], "register": 100},
+        {"name": "Switch 2", "type": "switch", "rect": [30, 0, 20, 20], "state": "up"},
+        {"name": "PLL Control 1", "type": "pll_control", "rect": [60, 0, 20, 20], "register": 200},
+        {"name": "Frequency Settings", "type": "frequency", "rect": [90, 0, 20, 20], "register": 300},
+    ])
+
+
+def make_switches(count=4):
+    return HotspotModel([f"Switch {i + 1}" for i in range(count)], [[i * 30, 0, 20, 20] for i in range(count)],
+                        [HotspotType.SWITCH] * count, [SwitchPosition.DEFAULT] * count)
+
+
+def cycle_edit(n):
+    # n-th edit of a sequence in which every edit changes something: hotspot n % 4 moves to the
+    # next position, wrapping DEFAULT -> UP -> DOWN -> DEFAULT
+    return [n % 4], (n // 4 + 1) % 3
+
+
+# --- HotspotModel ---
+
+def test_from_records():
+    hotspots = make_board()
+    assert hotspots.states.tolist() == [SwitchPosition.DEFAULT, SwitchPosition.UP, 0, 0]
+    assert hotspots.registers.tolist() == [100, -1, 200, 300]
+    assert hotspots.indices_of(HotspotType.SWITCH).tolist() == [0, 1]
+
+
+def test_parse_states():
+    hotspots = make_board()
+    indices, states = hotspots.parse_states({"PLL Control 1": "enabled", "Switch 2": "down", "Switch 1": "default"})
+    assert indices.dtype == np.intp and states.dtype == np.int8
+    assert indices.tolist() == [2, 1, 0]
+    assert states.tolist() == [PllState.ENABLED, SwitchPosition.DOWN, SwitchPosition.DEFAULT]
+    assert hotspots.states.tolist() == [SwitchPosition.DEFAULT, SwitchPosition.UP, 0, 0] # Parsing changes nothing
+    assert [len(array) for array in hotspots.parse_states({})] == [0, 0]
+
+
+@pytest.mark.parametrize("state_names, message", [
+    ({"Switch 9": "up"}, "Unknown hotspot"),
+    ({"Switch 1": "enabled"}, "Invalid state"), # A PLL state on a switch
+    ({"PLL Control 1": "up"}, "Invalid state"),
+    ({"Switch 1": "UP"}, "Invalid state"), # Names are case-sensitive
+    ({"Frequency Settings": "up"}, "Invalid state"), # Frequency hotspots have no state
+])
+def test_parse_states_rejects(state_names, message):
+    with pytest.raises(ValueError, match=message):
+        make_board().parse_states(state_names)
+
+
+# --- Settings files ---
+
+@pytest.mark.parametrize("settings", [
+    {}, {"states": {}}, {"frequency": "13.560 MHz"},
+    {"states": {"Switch 1": "up", "Switch 9": "sideways"}}, # Names are checked against a layout later
+])
+def test_check_settings_accepts(settings):
+    assert check_settings(settings) is settings
+
+
+@pytest.mark.parametrize("settings", [
+    [], "states", None,
+    {"states": ["Switch 1", "up"]},
+    {"states": {"Switch 1": 1}},
+    {"states": {"Switch 1": None}},
+    {"states": {}, "frequency": 13.56},
+])
+def test_check_settings_rejects(settings):
+    with pytest.raises(ValueError):
+        check_settings(settings)
+
+
+def test_load_settings(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"states": {"Switch 1": "up"}, "frequency": "13.560 MHz"}))
+    assert load_settings(str(path)) == {"states": {"Switch 1": "up"}, "frequency": "13.560 MHz"}
+    path.write_text(json.dumps({"states": {"Switch 1": True}}))
+    with pytest.raises(ValueError, match="Switch 1"):
+        load_settings(str(path))
+
+
+def test_edited_since():
+    hotspots = make_switches()
+    edits = hotspots.edits # What a poll notes before it reads
+    hotspots.mark_edited([1, 2])
+    assert hotspots.edited_since(edits, np.arange(4)).tolist() == [False, True, True, False]
+    later = hotspots.edits
+    hotspots.mark_edited([3])
+    assert hotspots.edited_since(later, np.arange(4)).tolist() == [False, False, False, True]
+    assert not hotspots.edited_since(hotspots.edits, np.arange(4)).any()
+
+
+# --- HotspotGridIndex ---
+
+def random_rects(count=300, seed=4):
+    # Overlapping rects of mixed sizes, some spanning many cells and some at negative coordinates
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-200, 800, size=(count, 2))
+    sizes = rng.choice([0.0, 5.0, 20.0, 150.0], size=(count, 2))
+    return np.hstack([positions, sizes])
+
+
+def scan_point(rects, x, y):
+    for i, (left, top, width, height) in enumerate(rects.tolist()):
+        if left <= x <= left + width and top <= y <= top + height:
+            return i
+    return None
+
+
+def test_query_point_matches_linear_scan():
+    rects = random_rects()
+    index = HotspotGridIndex(cell_size=32.0)
+    index.build(rects)
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-250, 950, size=(2000, 2)).tolist()
+    points += [[left, top] for left, top, _, _ in rects.tolist()] # Edges count as inside
+    points += [[left + width, top + height] for left, top, width, height in rects.tolist()]
+    for x, y in points:
+        # First match in model order, so the topmost of overlapping hotspots is the same as before
+        assert index.query_point(QPointF(x, y)) == scan_point(rects, x, y)
+
+
+def test_query_rect_matches_linear_scan():
+    rects = random_rects()
+    index = HotspotGridIndex(cell_size=32.0)
+    index.build(rects)
+    rng = np.random.default_rng(2)
+    for q_left, q_top, q_width, q_height in np.hstack([rng.uniform(-250, 900, size=(300, 2)),
+                                                       rng.uniform(0, 300, size=(300, 2))]).tolist():
+        expected = [i for i, (left, top, width, height) in enumerate(rects.tolist())
+                    if left <= q_left + q_width and q_left <= left + width
+                    and top <= q_top + q_height and q_top <= top + height]
+        assert index.query_rect(QRectF(q_left, q_top, q_width, q_height)) == expected
+
+
+def test_grid_index_insert_and_clear():
+    index = HotspotGridIndex(cell_size=10.0)
+    index.insert(7, 0, 0, 30, 30)
+    index.insert(3, 5, 5, 5, 5) # Inside the first, later in model order
+    assert index.query_point(QPointF(7, 7)) == 7
+    assert index.query_rect(QRectF(6, 6, 1, 1)) == [7, 3]
+    assert index.query_point(QPointF(31, 0)) is None
+    index.clear()
+    assert index.query_point(QPointF(7, 7)) is None and index.query_rect(QRectF(0, 0, 50, 50)) == []
+
+
+# --- HotspotHistory ---
+
+def test_undo_redo_across_limit():
+    hotspots = make_switches()
+    history = HotspotHistory(hotspots, limit=1000)
+    snapshots = [hotspots.states.copy()]
+    for n in range(1005):
+        history.record(*cycle_edit(n))
+        snapshots.append(hotspots.states.copy())
+    assert history.revision == 1005
+    assert history.base == 5 and len(history.deltas) == 1000
+
+    for revision in range(1004, 4, -1):
+        history.undo()
+        assert history.revision == revision
+        assert np.array_equal(hotspots.states, snapshots[revision])
+    assert not history.can_undo()
+    assert len(history.undo()) == 0 # Edits older than the limit are gone
+    assert np.array_equal(hotspots.states, snapshots[5])
+
+    for revision in range(6, 1006):
+        history.redo()
+        assert np.array_equal(hotspots.states, snapshots[revision])
+    assert not history.can_redo()
+    assert len(history.redo()) == 0
+
+
+def test_edit_after_undo_drops_redo_branch():
+    hotspots = make_switches()
+    history = HotspotHistory(hotspots)
+    history.record([0], SwitchPosition.UP)
+    history.record([1], SwitchPosition.UP)
+    history.record([2], SwitchPosition.UP)
+    history.undo()
+    history.undo()
+    assert history.can_redo()
+
+    history.record([3], SwitchPosition.DOWN)
+    assert history.revision == 2
+    assert not history.can_redo()
+    assert hotspots.states.tolist() == [SwitchPosition.UP, SwitchPosition.DEFAULT, SwitchPosition.DEFAULT,
+                                        SwitchPosition.DOWN]
+    history.undo()
+    assert hotspots.states.tolist() == [SwitchPosition.UP, 0, 0, 0]
+    with pytest.raises(ValueError):
+        history.checkout(3) # The discarded branch cannot be checked out either
+
+
+def test_diff_is_antisymmetric():
+    hotspots = make_switches()
+    history = HotspotHistory(hotspots)
+    snapshots = [hotspots.states.copy()]
+    for indices, state in [([0, 1], SwitchPosition.UP), ([1], SwitchPosition.DOWN), ([2], SwitchPosition.UP),
+                           ([2], SwitchPosition.DEFAULT), ([0, 3], SwitchPosition.DOWN)]:
+        history.record(indices, state)
+        snapshots.append(hotspots.states.copy())
+
+    for a in range(len(snapshots)):
+        for b in range(len(snapshots)):
+            forward_indices, forward_states = history.diff(a, b)
+            backward_indices, backward_states = history.diff(b, a)
+            order = np.argsort(forward_indices)
+            backward_order = np.argsort(backward_indices)
+            # Same hotspots either way, each going to the other revision's state
+            assert np.array_equal(forward_indices[order], backward_indices[backward_order])
+            changed = np.flatnonzero(snapshots[a] != snapshots[b])
+            assert np.array_equal(forward_indices[order], changed)
+            assert np.array_equal(forward_states[order], snapshots[b][changed])
+            assert np.array_equal(backward_states[backward_order], snapshots[a][changed])
+
+    # Edits that cancel out leave nothing to push
+    assert len(history.diff(2, 4)[0]) == 0
+
+
+def test_record_repeated_indices_last_write_wins():
+    hotspots = make_switches()
+    history = HotspotHistory(hotspots)
+    changed = history.record([1, 2, 1, 1], [SwitchPosition.UP, SwitchPosition.DOWN, SwitchPosition.DOWN,
+                                            SwitchPosition.UP])
+    assert sorted(changed.tolist()) == [1, 2]
+    assert hotspots.states.tolist() == [0, SwitchPosition.UP, SwitchPosition.DOWN, 0]
+    indices, before, after = history.deltas[-1]
+    assert sorted(zip(indices.tolist(), before.tolist(), after.tolist())) == [
+        (1, SwitchPosition.DEFAULT, SwitchPosition.UP), (2, SwitchPosition.DEFAULT, SwitchPosition.DOWN)]
+
+    # Repeats that end where they started are not an edit at all
+    assert len(history.record([0, 0], [SwitchPosition.UP, SwitchPosition.DEFAULT])) == 0
+    assert history.revision == 1
+
+    history.undo()
+    assert hotspots.states.tolist() == [0, 0, 0, 0]
+
+
+def test_frequency_follows_undo_and_redo():
+    hotspots = make_switches()
+    history = HotspotHistory(hotspots)
+    history.record([0], SwitchPosition.UP, 13560, None)
+    history.record([1], SwitchPosition.UP) # Leaves the frequency alone
+    assert len(history.record([], [], 27120, 13560)) == 0 # Frequency-only edits are still edits
+    assert history.revision == 3
+    assert len(history.record([], [], 27120, 27120)) == 0 and history.revision == 3
+
+    assert history.frequency_change(3, 2) == 13560
+    assert history.frequency_change(2, 1) is None
+    assert history.frequency_change(1, 0) is None # Nothing was known before the first edit
+    assert history.frequency_change(3, 0) is None
+    assert history.frequency_change(0, 3) == 27120
+    assert history.frequency_change(1, 3) == 27120
+
+    # Setting it back to where it was nets out
+    history.record([], [], 13560, 27120)
+    assert history.frequency_change(2, 4) is None
+    assert history.frequency_change(4, 3) == 27120
+
+    # A new edit after undo drops the redone frequency with the rest of the branch
+    history.checkout(1)
+    history.record([2], SwitchPosition.DOWN)
+    assert history.frequencies == [(None, 13560), None]
+    with pytest.raises(ValueError):
+        history.frequency_change(1, 3)
@@ -0,0 +1,242 @@
+import json
+import struct
+
+import pytest
+
+from test import (
+    DEFAULT_COMM_SETTINGS, DeviceClient, HotspotModel, ModbusError, ModbusProtocolError, ModbusTcpTransport,
+    StatePoller, MODBUS_MAX_READ_REGISTERS, MODBUS_MAX_WRITE_REGISTERS, coalesce_writes, configure_fixtures,
+    load_fixtures, register_spans
+)
+from loopback import LoopbackModbusServer
+
+
+class ScriptedSocket:
+    # Stands in for a connected socket: records what is sent, answers with a canned byte string
+    def __init__(self, reply):
+        self.reply = reply
+        self.sent = b""
+
+    def sendall(self, data):
+        self.sent += data
+
+    def recv(self, size):
+        chunk, self.reply = self.reply[:size], self.reply[size:]
+        return chunk
+
+    def close(self):
+        pass
+
+
+def scripted_transport(pdu, transaction_id=1, protocol_id=0, unit_id=1, length=None):
+    transport = ModbusTcpTransport("127.0.0.1", unit_id=1)
+    length = len(pdu) + 1 if length is None else length
+    transport.sock = ScriptedSocket(struct.pack(">HHHB", transaction_id, protocol_id, length, unit_id) + pdu)
+    return transport
+
+
+# --- Reply validation ---
+
+def test_read_registers():
+    transport = scripted_transport(bytes([0x03, 4]) + struct.pack(">HH", 7, 65535))
+    assert transport.read_registers(100, 2) == [7, 65535]
+    assert transport.sock.sent[7:] == struct.pack(">BHH", 0x03, 100, 2)
+
+
+@pytest.mark.parametrize("reply", [
+    dict(pdu=b"", length=1), # Empty PDU
+    dict(pdu=b"", length=0), # Length field too small for even the unit id
+    dict(pdu=bytes([0x03])), # Function code only
+    dict(pdu=bytes([0x03, 4]) + struct.pack(">H", 7)), # Fewer registers than the byte count says
+    dict(pdu=bytes([0x03, 2]) + struct.pack(">H", 7)), # Fewer registers than were asked for
+    dict(pdu=bytes([0x83])), # Exception reply without its code
+    dict(pdu=bytes([0x04, 4]) + struct.pack(">HH", 7, 8)), # Reply to another function
+    dict(pdu=bytes([0x03, 4]) + struct.pack(">HH", 7, 8), protocol_id=1),
+    dict(pdu=bytes([0x03, 4]) + struct.pack(">HH", 7, 8), unit_id=2),
+    dict(pdu=bytes([0x03, 4]) + struct.pack(">HH", 7, 8), transaction_id=9),
+])
+def test_malformed_read_reply(reply):
+    with pytest.raises(ModbusProtocolError):
+        scripted_transport(**reply).read_registers(100, 2)
+
+
+def test_malformed_write_reply():
+    with pytest.raises(ModbusProtocolError):
+        scripted_transport(bytes([0x06])).write_registers(100, [1])
+    with pytest.raises(ModbusProtocolError):
+        scripted_transport(bytes([0x10]) + struct.pack(">H", 100)).write_registers(100, [1, 2])
+    scripted_transport(bytes([0x10]) + struct.pack(">HH", 100, 2)).write_registers(100, [1, 2])
+
+
+def test_exception_reply_is_not_a_protocol_error():
+    with pytest.raises(ModbusError) as error:
+        scripted_transport(bytes([0x83, 2])).read_registers(100, 2)
+    assert not isinstance(error.value, ModbusProtocolError)
+
+
+class GarblingServer(LoopbackModbusServer):
+    # Answers the first request with an empty PDU, then behaves
+    garbled = False
+
+    def handle_pdu(self, pdu):
+        if not self.garbled:
+            self.garbled = True
+            return b""
+        return super().handle_pdu(pdu)
+
+
+def test_device_client_reconnects_after_protocol_error():
+    server = GarblingServer().start()
+    server.registers[10:12] = [5, 6]
+    client = DeviceClient(ModbusTcpTransport(server.host, server.port, timeout=2.0))
+    try:
+        with pytest.raises(ModbusProtocolError):
+            client.read_registers(10, 2).result(timeout=5)
+        assert not client.connected # Dropped, so the next reply cannot be read out of step
+        assert client.read_registers(10, 2).result(timeout=5) == [5, 6]
+    finally:
+        client.close()
+        server.stop()
+
+
+# --- Write coalescing ---
+
+def test_coalesce_writes_last_write_wins():
+    runs = coalesce_writes([(10, [1, 2, 3]), (20, [7]), (11, [9]), (13, [4]), (10, [5])])
+    assert runs == [(10, [5, 9, 3, 4]), (20, [7])]
+
+
+def test_coalesce_writes_splits_at_protocol_limit():
+    count = MODBUS_MAX_WRITE_REGISTERS * 2 + 5
+    writes = [(100 + i, [i]) for i in range(count)]
+    writes.append((100, [999])) # Overwrites the first register of the first run
+    runs = coalesce_writes(writes)
+    assert [len(values) for _, values in runs] == [MODBUS_MAX_WRITE_REGISTERS, MODBUS_MAX_WRITE_REGISTERS, 5]
+    assert [address for address, _ in runs] == [100, 100 + MODBUS_MAX_WRITE_REGISTERS,
+                                                100 + 2 * MODBUS_MAX_WRITE_REGISTERS]
+    assert runs[0][1][0] == 999
+    assert [value for _, values in runs for value in values][1:] == list(range(1, count))
+
+
+# --- Polling ---
+
+def test_register_spans():
+    assert register_spans([]) == []
+    assert register_spans([5, 3, 4, 3]) == [(3, 3)]
+    # Gaps up to max_gap are read through, wider ones start a new span
+    assert register_spans([100, 108, 200, 210], max_gap=8) == [(100, 9), (200, 1), (210, 1)]
+    # No span is longer than one read request allows
+    assert register_spans(range(MODBUS_MAX_READ_REGISTERS + 1)) == [
+        (0, MODBUS_MAX_READ_REGISTERS), (MODBUS_MAX_READ_REGISTERS, 1)]
+
+
+def test_poll_once_reports_only_changes():
+    hotspots = HotspotModel.from_records([
+        {"name": "Switch 1", "type": "switch", "rect": [0, 0, 20, 20], "register": 100},
+        {"name": "Switch 2", "type": "switch", "rect": [30, 0, 20, 20], "register": 101},
+        {"name": "PLL Control 1", "type": "pll_control", "rect": [60, 0, 20, 20], "register": 200},
+        {"name": "Frequency Settings", "type": "frequency", "rect": [90, 0, 20, 20], "register": 300},
+    ])
+    server = LoopbackModbusServer().start()
+    client = DeviceClient(ModbusTcpTransport(server.host, server.port, timeout=2.0))
+    poller = StatePoller(client, hotspots)
+    reports, frequencies = [], []
+    poller.states_changed.connect(lambda indices, states, edits: reports.append(
+        (indices.tolist(), states.tolist(), edits)))
+    poller.frequency_changed.connect(frequencies.append)
+    try:
+        assert poller.spans == [(100, 2), (200, 1), (300, 2)]
+        server.registers[300:302] = [0, 13560]
+        assert poller.poll_once() == 0 # Everything still at its default
+        assert frequencies == [13560]
+
+        server.registers[101] = 2
+        server.registers[200] = 7 # Out of range for a PLL: ignored
+        hotspots.mark_edited([0])
+        assert poller.poll_once() == 1
+        assert reports == [([1], [2], hotspots.edits)]
+        assert frequencies == [13560] # Unchanged, so not reported again
+    finally:
+        client.close()
+        server.stop()
+
+
+# --- Batch mode ---
+
+def batch_hotspots():
+    return HotspotModel.from_records([
+        {"name": "Switch 1", "type": "switch", "rect": [0, 0, 20, 20], "register": 100},
+        {"name": "Switch 2", "type": "switch", "rect": [30, 0, 20, 20], "register": 101},
+        {"name": "Frequency Settings", "type": "frequency", "rect": [90, 0, 20, 20], "register": 300},
+    ])
+
+
+def tcp_fixture(server, name, **fields):
+    return dict(DEFAULT_COMM_SETTINGS, name=name, interface="tcp", ip_address=server.host, tcp_port=server.port,
+                timeout_ms=2000, **fields)
+
+
+def test_configure_fixtures():
+    servers = [LoopbackModbusServer().start() for _ in range(2)]
+    settings = {"states": {"Switch 1": "up", "Switch 2": "down"}, "frequency": "13.560 MHz"}
+    fixtures = [tcp_fixture(servers[0], "Jig 1", unit_id=1), tcp_fixture(servers[0], "Jig 2", unit_id=2),
+                tcp_fixture(servers[1], "Jig 3", settings={"states": {"Switch 2": "up"}})]
+    reported = []
+    try:
+        results = configure_fixtures(fixtures, batch_hotspots(), settings, verify=True, progress=reported.append)
+        assert [result["name"] for result in results] == ["Jig 1", "Jig 2", "Jig 3"]
+        assert all(result["ok"] for result in results), results
+        assert sorted(result["name"] for result in reported) == ["Jig 1", "Jig 2", "Jig 3"]
+        # One coalesced write for the switches and one for the frequency, each read back
+        assert [result["transactions"] for result in results] == [4, 4, 2]
+        assert servers[0].registers[100:102] == [1, 2] and servers[0].registers[300:302] == [0, 13560]
+        assert servers[1].registers[100:102] == [0, 1] and servers[1].registers[300:302] == [0, 0]
+    finally:
+        for server in servers:
+            server.stop()
+
+
+class SilentServer(LoopbackModbusServer):
+    # Accepts connections but answers every request with an empty PDU
+    def handle_pdu(self, pdu):
+        return b""
+
+
+def test_configure_fixtures_reports_failures_per_fixture():
+    server, broken = LoopbackModbusServer().start(), SilentServer().start()
+    settings = {"states": {"Switch 1": "up"}}
+    fixtures = [tcp_fixture(broken, "Garbled"), tcp_fixture(server, "Good"),
+                tcp_fixture(server, "Unknown hotspot", settings={"states": {"Switch 9": "up"}}),
+                dict(tcp_fixture(server, "Bad unit"), unit_id="one"),
+                dict(DEFAULT_COMM_SETTINGS, name="No pyserial or no port", interface="uart",
+                     port="/nonexistent/tty")]
+    try:
+        results = configure_fixtures(fixtures, batch_hotspots(), settings)
+        assert [result["ok"] for result in results] == [False, True, False, False, False]
+        assert all(result["error"] for result in results if not result["ok"])
+        assert "Switch 9" in results[2]["error"]
+        assert server.registers[100] == 1
+    finally:
+        server.stop()
+        broken.stop()
+
+
+@pytest.mark.parametrize("fields", [
+    dict(parity="X"), dict(baud_rate="fast"), dict(data_bits=9), dict(stop_bits="3"), dict(port=""),
+    dict(interface="can"), dict(interface="tcp", tcp_port=70000), dict(interface="tcp", ip_address=None),
+    dict(unit_id=-1), dict(timeout_ms="soon"), dict(timeout_ms=float("nan")),
+])
+def test_load_fixtures_rejects_bad_comm_settings(tmp_path, fields):
+    path = tmp_path / "fixtures.json"
+    path.write_text(json.dumps({"fixtures": [{"name": "Jig 1"}, dict({"name": "Jig 2"}, **fields)]}))
+    with pytest.raises(ValueError, match="Jig 2"):
+        load_fixtures(str(path))
+
+
+def test_load_fixtures_fills_defaults(tmp_path):
+    path = tmp_path / "fixtures.json"
+    path.write_text(json.dumps([{"name": "Jig 1", "interface": "tcp", "ip_address": "10.0.0.2", "tcp_port": "1502"},
+                                {"name": "Jig 2", "parity": "E", "baud_rate": 115200}]))
+    fixtures = load_fixtures(str(path))
+    assert fixtures[0]["unit_id"] == DEFAULT_COMM_SETTINGS["unit_id"]
+    assert fixtures[1]["port"] == DEFAULT_COMM_SETTINGS["port"] and fixtures[1]["parity"] == "E"